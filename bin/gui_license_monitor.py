@@ -20,17 +20,23 @@ import subprocess
 from io import BytesIO
 from datetime import datetime, date, timedelta
 import calendar
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from string import Template
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QDateEdit, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QDateEdit, QLabel, QPushButton, QTableView,
     QTabWidget, QGroupBox, QGridLayout, QMessageBox,
     QFileDialog, QProgressBar, QStatusBar, QListWidget, QListWidgetItem,
     QAbstractItemView, QFrame, QCheckBox, QComboBox,
-    QSplitter, QLineEdit,
+    QSplitter, QLineEdit, QHeaderView,
+)
+from PyQt5.QtCore import (
+    Qt, QDate, QThread, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex,
 )
-from PyQt5.QtCore import Qt, QDate, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -38,8 +44,14 @@ from matplotlib.figure import Figure
 from matplotlib.dates import DateFormatter
 import matplotlib.dates as mdates
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:     # optional: session detection falls back to NumPy
+    njit = None
+
 import hashlib
 import hmac as _hmac
 import uuid
@@ -64,6 +76,7 @@ EXPORT_DIR = BASE_DIR / "exports"
 
 USER_RE = re.compile(r"^[a-z0-9]+-[a-z]{4}$")
 SNAPSHOT_INTERVAL_MIN = None       # auto-detected from data via median gap
+SESSION_GAP_FACTOR = 2.5           # gap > 2.5x interval starts a new session
 
 
 # ============================================================
@@ -235,6 +248,20 @@ _LICENSE_SERVER_URL = ""                          # set to your validation endpo
 _TRIAL_DAYS = 14
 _STATE_PATH = Path.home() / ".license_monitor_state.json"
 
+# Keyed HMAC for the embedded secret; copies reuse the derived inner/outer pads
+_HMAC_PROTOTYPE = _hmac.new(_LICENSE_SECRET, digestmod="sha256")
+
+
+def _license_signature(sig_data, secret=_LICENSE_SECRET):
+    """Return the 8-char uppercase HMAC-SHA256 signature for key data."""
+    if isinstance(secret, bytes) and _hmac.compare_digest(secret, _LICENSE_SECRET):
+        h = _HMAC_PROTOTYPE.copy()
+        h.update(sig_data)
+    else:
+        h = _hmac.new(secret, sig_data, "sha256")
+    return h.hexdigest()[:8].upper()
+
+
 def _get_encryption_key(machine_id):
     """Derive a Fernet encryption key from machine ID."""
     hash_obj = hashlib.sha256(machine_id.encode())
@@ -409,9 +436,9 @@ class LicenseManager:
 
             # Validate HMAC signature
             sig_data = f"{expiry_str}:{machine_sig}".encode()
-            expected_sig = _hmac.new(_LICENSE_SECRET, sig_data, hashlib.sha256).hexdigest()[:8].upper()
+            expected_sig = _license_signature(sig_data)
 
-            if verify_sig != expected_sig:
+            if not _hmac.compare_digest(verify_sig.encode(), expected_sig.encode()):
                 return (False, "Invalid key signature (tampered key?)")
 
             return (True, f"Key valid until {expiry}")
@@ -764,6 +791,33 @@ class IngestThread(QThread):
             self.error_occurred.emit(f"{self.label} error: {e}")
 
 
+class CsvExportThread(QThread):
+    """Background thread that writes a DataFrame to CSV."""
+
+    export_complete = pyqtSignal(str, int)   # file path, record count
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, df, file_path):
+        super().__init__()
+        self.df = df
+        self.file_path = file_path
+
+    def run(self):
+        # Write beside the target and rename on success, so a failed export
+        # leaves no partial file and any previous export intact
+        tmp_path = f"{self.file_path}.part"
+        try:
+            self.df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.file_path)
+            self.export_complete.emit(self.file_path, len(self.df))
+        except Exception as e:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            self.error_occurred.emit(str(e))
+
+
 # ============================================================
 # Helper: time-bin aggregation and X-axis scaling
 # ============================================================
@@ -818,14 +872,15 @@ def aggregate_by_time_bin(df, start_date, end_date, override_granularity=None):
         granularity, bin_fmt, tick_fmt = determine_granularity(start_date, end_date)
 
     df = df.copy()
-    df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    if "datetime" not in df:
+        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
     df.dropna(subset=["datetime"], inplace=True)
 
     df["time_bin"] = df["datetime"].apply(lambda dt: assign_time_bin(dt, granularity, bin_fmt))
 
     # Step 1: concurrent licenses per snapshot (ts) per feature
     per_snap = (
-        df.groupby(["ts", "time_bin", "feature"])
+        df.groupby(["ts", "time_bin", "feature"], observed=True)
         .agg(
             concurrent=("user", "size"),
             unique_users=("user", "nunique"),
@@ -835,7 +890,7 @@ def aggregate_by_time_bin(df, start_date, end_date, override_granularity=None):
 
     # Step 2: aggregate per-snapshot values into time bins (peak concurrent)
     agg = (
-        per_snap.groupby(["time_bin", "feature"])
+        per_snap.groupby(["time_bin", "feature"], observed=True)
         .agg(
             concurrent=("concurrent", "max"),
             unique_users=("unique_users", "max"),
@@ -903,19 +958,291 @@ def fill_missing_time_bins(agg, start_date, end_date, granularity, bin_fmt):
 
 
 # ============================================================
-# Custom table item for numeric sorting with formatted display
+# Session detection kernel (numba-compiled when available)
 # ============================================================
 
-class NumericSortItem(QTableWidgetItem):
-    """QTableWidgetItem that displays formatted text but sorts numerically."""
-    def __init__(self, display_text, sort_value):
-        super().__init__(display_text)
-        self._sort_value = sort_value
+def _session_kernel_np(ts_ns, gap_ns):
+    """Return (session_count, summed within-session gaps in ns) for sorted int64 ts."""
+    d = np.diff(ts_ns)
+    breaks = d > gap_ns
+    return int(breaks.sum()) + 1, int(d[~breaks].sum())
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _session_kernel(ts_ns, gap_ns):
+        """Single-pass equivalent of _session_kernel_np."""
+        sessions = 1
+        within_ns = 0
+        for i in range(1, ts_ns.shape[0]):
+            d = ts_ns[i] - ts_ns[i - 1]
+            if d > gap_ns:
+                sessions += 1
+            else:
+                within_ns += d
+        return sessions, within_ns
+else:
+    _session_kernel = _session_kernel_np
+
+
+def _grouped_session_kernel_np(starts, ts_ns, gap_ns):
+    """Per-group _session_kernel_np over contiguous groups beginning at `starts`.
 
-    def __lt__(self, other):
-        if isinstance(other, NumericSortItem):
-            return self._sort_value < other._sort_value
-        return super().__lt__(other)
+    ts_ns must be sorted within each group. Returns int64 arrays
+    (session_counts, within_ns), one entry per group.
+    """
+    d = np.diff(ts_ns, prepend=ts_ns[:1])
+    new_session = d > gap_ns
+    new_session[starts] = True      # a diff across a group boundary starts a session
+    within = np.where(new_session, 0, d)
+    return (np.add.reduceat(new_session.astype(np.int64), starts),
+            np.add.reduceat(within, starts))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _grouped_session_kernel(starts, ts_ns, gap_ns):
+        """Single-pass equivalent of _grouped_session_kernel_np."""
+        n_groups = starts.shape[0]
+        sessions = np.ones(n_groups, dtype=np.int64)
+        within_ns = np.zeros(n_groups, dtype=np.int64)
+        for g in range(n_groups):
+            end = starts[g + 1] if g + 1 < n_groups else ts_ns.shape[0]
+            for i in range(starts[g] + 1, end):
+                d = ts_ns[i] - ts_ns[i - 1]
+                if d > gap_ns:
+                    sessions[g] += 1
+                else:
+                    within_ns[g] += d
+        return sessions, within_ns
+else:
+    _grouped_session_kernel = _grouped_session_kernel_np
+
+
+# ============================================================
+# Table model backing the Statistics / User Activity / Details tabs
+# ============================================================
+
+class PandasTableModel(QAbstractTableModel):
+    """Read-only model over a DataFrame; Qt only asks for the cells it paints.
+
+    Cells keep their raw values so sorting stays numeric. ``formats`` maps a
+    column position to a callable producing the display text, and
+    ``backgrounds`` maps a column position to a per-row array of QColor/None.
+    """
+
+    def __init__(self, headers, tooltips=None, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._tooltips = tooltips or {}
+        self._columns = [np.empty(0, dtype=object) for _ in self._headers]
+        self._formats = {}
+        self._backgrounds = {}
+        self._n_rows = 0
+
+    def setDataFrame(self, df, formats=None, backgrounds=None):
+        self.beginResetModel()
+        self._n_rows = len(df)
+        self._columns = [df.iloc[:, c].to_numpy(dtype=object) for c in range(len(self._headers))]
+        self._formats = formats or {}
+        self._backgrounds = {c: np.asarray(colors, dtype=object)
+                             for c, colors in (backgrounds or {}).items()}
+        self.endResetModel()
+
+    def clear(self):
+        self.setDataFrame(pd.DataFrame(columns=range(len(self._headers))))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._n_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        col = index.column()
+        if role == Qt.DisplayRole:
+            value = self._columns[col][index.row()]
+            fmt = self._formats.get(col)
+            if fmt is not None:
+                return fmt(value)
+            if value is None or isinstance(value, (str, int, float)):
+                return value
+            return str(value)
+        if role == Qt.BackgroundRole and col in self._backgrounds:
+            return self._backgrounds[col][index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self._headers[section]
+            if role == Qt.ToolTipRole:
+                return self._tooltips.get(section)
+        elif role == Qt.DisplayRole:
+            return section + 1
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0 or self._n_rows == 0:
+            return
+        self.layoutAboutToBeChanged.emit()
+        keys = pd.Series(self._columns[column])
+        perm = keys.sort_values(ascending=(order == Qt.AscendingOrder), kind="mergesort",
+                                na_position="last").index.to_numpy()
+        self._columns = [values[perm] for values in self._columns]
+        self._backgrounds = {c: colors[perm] for c, colors in self._backgrounds.items()}
+        self.layoutChanged.emit()
+
+
+# Utilization cell colors: green / yellow / red / gray (no policy)
+_UTIL_COLORS = np.array([
+    QColor(144, 238, 144), QColor(255, 255, 153), QColor(255, 182, 182), QColor(220, 220, 220),
+], dtype=object)
+_UTIL_HEX = np.array(["#90ee90", "#ffff99", "#ffb6b6", "#dcdcdc"])   # same palette for HTML
+
+
+def util_color_bucket(values, high, low):
+    """Map utilization percentages to _UTIL_COLORS indices; NaN means no policy."""
+    values = np.asarray(values, dtype=float)
+    return np.select([np.isnan(values), values >= high, values >= low], [3, 0, 1], default=2)
+
+
+def _hours_text(value):
+    """Hours always show 2 decimal places."""
+    return f"{value:.2f}"
+
+
+# Same replacements as html.escape(), applied with a single C-level translate pass
+_HTML_ESC = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+
+def _html_text(value):
+    """HTML-escape str(value) for report cells and attributes."""
+    return str(value).translate(_HTML_ESC)
+
+
+def _html_rows(columns):
+    """Join equal-length object arrays of cell HTML into "<tr><td>...</td></tr>" lines.
+
+    Concatenation runs column by column over whole arrays instead of one
+    f-string per row.
+    """
+    rows = "<tr><td>" + columns[0]
+    for col in columns[1:]:
+        rows = rows + "</td><td>" + col
+    return "\n".join(rows + "</td></tr>")
+
+
+def _text_cells(series):
+    """HTML-escaped cell text for a column of names."""
+    return series.astype(str).str.translate(_HTML_ESC).to_numpy(dtype=object)
+
+
+def _plain_cells(series, fmt=None):
+    """Unescaped cell text for numbers and timestamps: str() by default, or fmt per value."""
+    cells = series.astype(str) if fmt is None else series.map(fmt)
+    return cells.to_numpy(dtype=object)
+
+
+# Static parts of the HTML report, formatted once at import
+_REPORT_CSS = """\
+  body { font-family: 'Segoe UI', Arial, sans-serif; margin: 20px 40px;
+         color: #222; background: #fafafa; }
+  h1 { color: #1a3a5c; border-bottom: 3px solid #1a3a5c; padding-bottom: 8px; }
+  h2 { color: #2a5a8c; margin-top: 36px; border-bottom: 1px solid #ccc;
+        padding-bottom: 4px; }
+  .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+                   gap: 12px; margin: 16px 0; }
+  .summary-card { background: #fff; border: 1px solid #ddd; border-radius: 6px;
+                   padding: 14px; text-align: center; }
+  .summary-card .label { font-size: 0.85em; color: #666; }
+  .summary-card .value { font-size: 1.6em; font-weight: bold; color: #1a3a5c; }
+  table { border-collapse: collapse; width: 100%; margin: 12px 0; font-size: 0.92em; }
+  th { background: #1a3a5c; color: #fff; padding: 8px 10px; text-align: left; }
+  td { padding: 6px 10px; border-bottom: 1px solid #ddd; }
+  tr:nth-child(even) { background: #f4f7fa; }
+  tr:hover { background: #e8eef5; }
+  .chart-container { text-align: center; margin: 16px 0; }
+  .chart-container img { max-width: 100%; border: 1px solid #ccc; border-radius: 4px; }
+  .util-cell { font-weight: bold; padding: 4px 8px; border-radius: 3px; text-align: center; }
+  .alert-banner { background: #fff3cd; border: 1px solid #ffc107; border-radius: 6px;
+                   padding: 12px 16px; margin: 16px 0; color: #856404; }
+  .alert-banner h3 { margin: 0 0 6px 0; color: #856404; }
+  .over-highlight { background: #ffe0e0; font-weight: bold; }
+  .tab-bar { display: flex; flex-wrap: wrap; gap: 0; margin-top: 24px;
+              border-bottom: 3px solid #1a3a5c;
+              position: sticky; top: 0; z-index: 100;
+              background: #fff; padding-top: 8px; }
+  .tab-btn { padding: 10px 22px; cursor: pointer; background: #e8eef5;
+              border: 1px solid #ccc; border-bottom: none; border-radius: 6px 6px 0 0;
+              font-size: 0.95em; font-weight: bold; color: #1a3a5c;
+              margin-right: 2px; transition: background 0.15s; }
+  .tab-btn:hover { background: #d0dced; }
+  .tab-btn.active { background: #1a3a5c; color: #fff; border-color: #1a3a5c; }
+  .tab-content { display: none; padding: 16px 0; }
+  .tab-content.active { display: block; }
+  .footer { margin-top: 40px; padding-top: 10px; border-top: 1px solid #ccc;
+             font-size: 0.82em; color: #888; }
+  @media print {
+    body { margin: 10px; }
+    .summary-card { break-inside: avoid; }
+    table { page-break-inside: auto; }
+    tr { page-break-inside: avoid; }
+    .tab-bar { display: none; }
+    .tab-content { display: block !important; page-break-before: always; }
+  }
+"""
+
+_REPORT_JS_TEMPLATE = Template("""\
+function switchTab(tabId) {
+  document.querySelectorAll('.tab-content').forEach(function(el) {
+    el.classList.remove('active');
+  });
+  document.querySelectorAll('.tab-btn').forEach(function(el) {
+    el.classList.remove('active');
+  });
+  document.getElementById(tabId).classList.add('active');
+  var btns = document.querySelectorAll('.tab-btn');
+  var ids = $tab_ids;
+  for (var i = 0; i < ids.length; i++) {
+    if (ids[i] === tabId) { btns[i].classList.add('active'); break; }
+  }
+}
+""")
+
+# Per-row templates for the report tables, parsed once; rows are filled with format_map
+_ROW_FMT_STATS = (
+    "<tr><td>{feature}</td><td>{total_checkouts:,}</td>"
+    "<td>{unique_users}</td><td>{active_days}</td>"
+    "<td>{avg_concurrent}</td><td>{peak_concurrent}</td>"
+    "<td>{est_usage_hours}</td><td>{first_seen}</td><td>{last_seen}</td>"
+    "<td>{policy_max}</td>{au_cell}{pu_cell}</tr>"
+)
+_UTIL_CELL_FMT = '<td><span class="util-cell" style="background:{color};">{text}</span></td>'
+_UTIL_CELL_NA = _UTIL_CELL_FMT.format(color="#dcdcdc", text="N/A")
+_ROW_FMT_OVERUSE = (
+    '<tr class="over-highlight">'
+    "<td>{feature}</td><td>{policy_max}</td>"
+    "<td>{peak_concurrent}</td><td>+{max_excess}</td>"
+    "<td>{over_snapshots}</td><td>{total_snapshots}</td>"
+    "<td>{over_pct:.1f}%</td>"
+    "<td>{est_duration}</td>"
+    "<td>{first_over}</td><td>{last_over}</td></tr>"
+)
+
+
+@contextmanager
+def suspended_updates(table):
+    """Suspend repaints and signals on a table while it is bulk-populated."""
+    table.setUpdatesEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setUpdatesEnabled(True)
 
 
 # ============================================================
@@ -933,12 +1260,17 @@ class LicenseMonitorGUI(QMainWindow):
         self.analyzer_thread = None
         self.collector_thread = None
         self.ingest_thread = None
+        self.csv_export_thread = None
         self._collect_then_analyze = False
         self.policy_rows = []         # [(user, company, feature, policy_max), ...]
         self.policy_map = {}          # {feature: policy_max} — computed per filter
         self.user_company_map = {}    # {user: company} — from policy
         self.config = {}              # parsed from conf/license_monitor.conf.csh
         self.last_exported_html = None  # track last exported HTML file path
+        self._cached_interval = None      # detected snapshot interval, per Analyze run
+        self._cached_period_hours = None  # period length, until the dates change
+        self._cached_period_days = None
+        self._report_figs = queue.SimpleQueue()  # idle (Figure, BytesIO) pairs reused by HTML export charts
 
         self._init_ui()
         self._load_policy()
@@ -1256,48 +1588,54 @@ class LicenseMonitorGUI(QMainWindow):
         self.tabs.addTab(chart_widget, "Usage Trend")
 
         # Tab 2: Statistics table
-        self.stats_table = QTableWidget()
-        self.stats_table.setColumnCount(12)
-        self.stats_table.setHorizontalHeaderLabels([
+        self.stats_model = PandasTableModel([
             "Feature", "Total Checkouts", "Unique Users", "Active Days",
             "Avg When Active", "Peak Concurrent", "Usage Hours",
             "First Seen", "Last Seen",
             "Policy Max", "Active Util. %", "Period Util. %",
-        ])
-        # Add tooltips to explain metrics
-        header = self.stats_table.horizontalHeader()
-        self.stats_table.horizontalHeaderItem(4).setToolTip(
-            "Average concurrent licenses during active snapshots only\n"
-            "(excludes zero-usage periods)")
-        self.stats_table.horizontalHeaderItem(10).setToolTip(
-            "Avg When Active / Policy Max × 100%\n"
-            "Shows how much of the policy limit is used when feature is active")
-        self.stats_table.horizontalHeaderItem(11).setToolTip(
-            "Usage Hours / (Policy Max × Period Hours) × 100%\n"
-            "Overall utilization across the entire time period")
-        header.setStretchLastSection(True)
+        ], tooltips={
+            # Tooltips to explain metrics
+            4: "Average concurrent licenses during active snapshots only\n"
+               "(excludes zero-usage periods)",
+            10: "Avg When Active / Policy Max × 100%\n"
+                "Shows how much of the policy limit is used when feature is active",
+            11: "Usage Hours / (Policy Max × Period Hours) × 100%\n"
+                "Overall utilization across the entire time period",
+        }, parent=self)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
+        self.stats_table.horizontalHeader().setStretchLastSection(True)
+        # Keep rows in the order they were built until a header is clicked
+        self.stats_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.stats_table.setSortingEnabled(True)
         self.tabs.addTab(self.stats_table, "Statistics")
 
         # Tab 3: User Activity table
-        self.user_activity_table = QTableWidget()
-        self.user_activity_table.setColumnCount(12)
-        self.user_activity_table.setHorizontalHeaderLabels([
+        self.user_activity_model = PandasTableModel([
             "User", "Company", "Features Used", "Total Checkouts",
             "Usage Hours", "Active Days", "First Active", "Last Active",
             "Avg Hrs/Day", "Avg Hrs/Day/Copy", "Sessions", "Avg Session Hrs",
-        ])
+        ], parent=self)
+        self.user_activity_table = QTableView()
+        self.user_activity_table.setModel(self.user_activity_model)
         self.user_activity_table.horizontalHeader().setStretchLastSection(True)
+        self.user_activity_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        # Size columns from the first rows only instead of measuring every cell
+        self.user_activity_table.verticalHeader().setResizeContentsPrecision(50)
+        self.user_activity_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.user_activity_table.setSortingEnabled(True)
         self.tabs.addTab(self.user_activity_table, "User Activity")
 
         # Tab 4: Details table
-        self.detail_table = QTableWidget()
-        self.detail_table.setColumnCount(5)
-        self.detail_table.setHorizontalHeaderLabels([
+        self.detail_model = PandasTableModel([
             "Timestamp", "Feature", "User", "Company", "Host",
-        ])
+        ], parent=self)
+        self.detail_table = QTableView()
+        self.detail_table.setModel(self.detail_model)
         self.detail_table.horizontalHeader().setStretchLastSection(True)
+        self.detail_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.detail_table.verticalHeader().setResizeContentsPrecision(50)
+        self.detail_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.detail_table.setSortingEnabled(True)
         self.tabs.addTab(self.detail_table, "Details")
 
@@ -1335,15 +1673,16 @@ class LicenseMonitorGUI(QMainWindow):
         """Compute {feature: SUM(policy_max)} filtered by selected users."""
         self.policy_map = self._policy_map_for_users(selected_users)
 
-    def _policy_map_for_users(self, users=None):
+    def _policy_map_for_users(self, users=None, rows=None):
         """Return {feature: total_policy_max} for given user set (or all if None).
 
         Aggregation: MAX(policy_max) within each (company, feature),
-        then SUM across companies per feature.
+        then SUM across companies per feature. `rows` restricts the scan to a
+        pre-filtered subset of self.policy_rows.
         """
         # Step 1: per (company, feature) -> MAX(policy_max)
         company_feat = {}
-        for user, company, feature, pmax in self.policy_rows:
+        for user, company, feature, pmax in (self.policy_rows if rows is None else rows):
             if users is not None and user not in users:
                 continue
             key = (company, feature)
@@ -1378,12 +1717,12 @@ class LicenseMonitorGUI(QMainWindow):
         if not EXPORT_DIR.exists():
             return
 
-        html_files = sorted(EXPORT_DIR.glob("*.html"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if html_files:
+        newest = max(EXPORT_DIR.glob("*.html"), key=lambda p: p.stat().st_mtime, default=None)
+        if newest is not None:
             # Enable button if exports exist
             self.view_html_btn.setEnabled(True)
             # Set last_exported_html to the most recent file
-            self.last_exported_html = str(html_files[0])
+            self.last_exported_html = str(newest)
 
     # --------------------------------------------------------
     # Collect lmstat snapshot
@@ -1589,6 +1928,7 @@ class LicenseMonitorGUI(QMainWindow):
     # --------------------------------------------------------
     def _on_custom_date_changed(self):
         """User manually changed a date picker — deactivate Quick selector."""
+        self._invalidate_period_cache()
         if self.quick_granularity.currentText() != "(None)":
             self.quick_granularity.blockSignals(True)
             self.quick_granularity.setCurrentText("(None)")
@@ -1739,8 +2079,16 @@ class LicenseMonitorGUI(QMainWindow):
         self.progress_bar.setValue(pct)
 
     def _on_analysis_complete(self, df, file_count):
+        if not df.empty:
+            # Parse timestamps once; filtered views and report builders reuse them
+            df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+            # Group keys as categoricals: groupby/nunique work on int codes
+            for col in ("user", "feature", "company", "host"):
+                if col in df:
+                    df[col] = df[col].astype("category")
         self.raw_data = df
         self._cached_interval = None   # reset so interval is re-detected
+        self._invalidate_period_cache()
         self._stop_analyze_anim()
         self.analyze_btn.setEnabled(True)
         self.analyze_btn.setText("Analyze")
@@ -2140,13 +2488,11 @@ class LicenseMonitorGUI(QMainWindow):
         which is robust against ad-hoc collections (GUI 'Collect Now' etc.).
         Falls back to 5 minutes if insufficient data.
         """
-        if getattr(self, '_cached_interval', None) is not None:
+        if self._cached_interval is not None:
             return self._cached_interval
         if self.raw_data is None or self.raw_data.empty:
             return SNAPSHOT_INTERVAL_MIN or 5
-        timestamps = pd.to_datetime(
-            self.raw_data["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
-        ).dropna()
+        timestamps = self.raw_data["datetime"].dropna()
         unique_ts = sorted(timestamps.unique())
         if len(unique_ts) < 2:
             return SNAPSHOT_INTERVAL_MIN or 5
@@ -2158,67 +2504,80 @@ class LicenseMonitorGUI(QMainWindow):
         return self._cached_interval
 
     @staticmethod
-    def _compute_sessions(ts_series, interval_min):
-        """Detect sessions and compute total session duration.
+    def _compute_sessions_np(ts_ns, interval_min):
+        """Detect sessions over a sorted array of timestamps.
 
+        ts_ns is int64 nanoseconds (or datetime64, converted here).
         Returns (session_count, total_session_hours).
         A session = consecutive snapshots with gap <= 2.5x interval.
         Duration per session = (last_ts - first_ts) + interval.
         """
-        ts_parsed = pd.to_datetime(ts_series, format="%Y-%m-%d %H:%M:%S", errors="coerce").dropna()
-        unique_ts = sorted(ts_parsed.unique())
-        if not unique_ts:
+        ts_ns = np.asarray(ts_ns)
+        if ts_ns.dtype.kind == "M":
+            ts_ns = ts_ns.astype("datetime64[ns]").view("i8")
+        if ts_ns.size == 0:
             return 0, 0.0
-        if len(unique_ts) == 1:
-            return 1, round(interval_min / 60.0, 2)
-
-        gap_threshold = pd.Timedelta(minutes=interval_min * 2.5)
-        interval_td = pd.Timedelta(minutes=interval_min)
-
-        session_hours = []
-        session_start = unique_ts[0]
-        session_end = unique_ts[0]
 
-        for i in range(1, len(unique_ts)):
-            if (unique_ts[i] - unique_ts[i - 1]) > gap_threshold:
-                # Close current session
-                dur = (session_end - session_start) + interval_td
-                session_hours.append(dur.total_seconds() / 3600.0)
-                session_start = unique_ts[i]
-            session_end = unique_ts[i]
+        interval_ns = interval_min * 60 * 1_000_000_000
+        gap_ns = interval_ns * SESSION_GAP_FACTOR
 
-        # Close last session
-        dur = (session_end - session_start) + interval_td
-        session_hours.append(dur.total_seconds() / 3600.0)
+        n_sessions, within_ns = _session_kernel(np.ascontiguousarray(ts_ns, dtype=np.int64), gap_ns)
+        # Gaps inside a session count in full; each session adds one interval
+        total_ns = float(within_ns) + int(n_sessions) * interval_ns
+        return int(n_sessions), round(total_ns / 3.6e12, 2)
 
-        return len(session_hours), round(sum(session_hours), 2)
+    @classmethod
+    def _compute_sessions(cls, ts_series, interval_min):
+        """Series wrapper around _compute_sessions_np for unsorted "ts" strings."""
+        ts_parsed = pd.to_datetime(ts_series, format="%Y-%m-%d %H:%M:%S", errors="coerce").dropna()
+        return cls._compute_sessions_np(np.sort(ts_parsed.to_numpy(dtype="datetime64[ns]")),
+                                        interval_min)
 
-    @staticmethod
-    def _make_numeric_item(value):
-        """Create a QTableWidgetItem that sorts numerically."""
-        item = QTableWidgetItem()
-        item.setData(Qt.DisplayRole, value)
-        return item
+    @classmethod
+    def _session_stats(cls, df, keys, interval_min):
+        """Run session detection once per group of `keys` in a single groupby pass.
 
-    @staticmethod
-    def _make_hours_item(value):
-        """Create a QTableWidgetItem for hours that always shows 2 decimal places."""
-        return NumericSortItem(f"{value:.2f}", float(value))
+        Expects a parsed "datetime" column. Returns a DataFrame indexed by
+        `keys` with columns (sessions, hours); groups with no valid timestamp
+        are omitted.
+        """
+        valid = df.dropna(subset=["datetime"])
+        if valid.empty:
+            index = pd.MultiIndex.from_tuples([], names=keys)
+            return pd.DataFrame({"sessions": [], "hours": []}, index=index)
+        # Sort once so every group is a contiguous, time-ordered block
+        valid = valid.sort_values(keys + ["datetime"])
+        grouped = valid.groupby(keys, sort=False, observed=True)
+        codes = grouped.ngroup().to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ts_ns = np.ascontiguousarray(valid["datetime"].to_numpy(dtype="datetime64[ns]").view("i8"))
+
+        interval_ns = interval_min * 60 * 1_000_000_000
+        sessions, within_ns = _grouped_session_kernel(starts, ts_ns, interval_ns * SESSION_GAP_FACTOR)
+        # Same arithmetic as _compute_sessions_np, rounded per group
+        total_ns = within_ns.astype(np.float64) + sessions * interval_ns
+        hours = [round(h, 2) for h in (total_ns / 3.6e12).tolist()]
+        return pd.DataFrame({"sessions": sessions, "hours": hours}, index=grouped.size().index)
 
     # --------------------------------------------------------
     # Statistics tab
     # --------------------------------------------------------
+    def _invalidate_period_cache(self):
+        self._cached_period_hours = None
+        self._cached_period_days = None
+
     def _get_period_hours(self):
         """Calculate total hours in the selected period."""
-        start_qd = self.start_date_edit.date()
-        end_qd = self.end_date_edit.date()
-        start_dt = datetime(start_qd.year(), start_qd.month(), start_qd.day())
-        end_dt = datetime(end_qd.year(), end_qd.month(), end_qd.day(), 23, 59, 59)
-        return max((end_dt - start_dt).total_seconds() / 3600.0, 1.0)
+        if self._cached_period_hours is None:
+            start_qd = self.start_date_edit.date()
+            end_qd = self.end_date_edit.date()
+            start_dt = datetime(start_qd.year(), start_qd.month(), start_qd.day())
+            end_dt = datetime(end_qd.year(), end_qd.month(), end_qd.day(), 23, 59, 59)
+            self._cached_period_hours = max((end_dt - start_dt).total_seconds() / 3600.0, 1.0)
+        return self._cached_period_hours
 
     def _update_stats(self, df):
         self.stats_table.setSortingEnabled(False)
-        self.stats_table.setRowCount(0)
 
         # Merge features from data with features from policy_map
         data_features = set(df["feature"].unique()) if not df.empty else set()
@@ -2226,17 +2585,15 @@ class LicenseMonitorGUI(QMainWindow):
         all_features = sorted(data_features | policy_features)
 
         if not all_features:
+            self.stats_model.clear()
             self.stats_table.setSortingEnabled(True)
             return
 
-        if not df.empty:
-            df = df.copy()
-            df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
-
         interval_min = self._snapshot_interval_minutes()
         period_hours = self._get_period_hours()
 
-        for row_idx, feat in enumerate(all_features):
+        rows = []
+        for feat in all_features:
             if not df.empty and feat in data_features:
                 fdf = df[df["feature"] == feat]
                 total_checkouts = len(fdf)
@@ -2271,57 +2628,43 @@ class LicenseMonitorGUI(QMainWindow):
 
             policy_max = self.policy_map.get(feat, None)
 
-            self.stats_table.insertRow(row_idx)
-            self.stats_table.setItem(row_idx, 0, QTableWidgetItem(feat))
-            self.stats_table.setItem(row_idx, 1, self._make_numeric_item(total_checkouts))
-            self.stats_table.setItem(row_idx, 2, self._make_numeric_item(unique_users))
-            self.stats_table.setItem(row_idx, 3, self._make_numeric_item(active_days))
-            self.stats_table.setItem(row_idx, 4, self._make_numeric_item(avg_concurrent))
-            self.stats_table.setItem(row_idx, 5, self._make_numeric_item(peak_concurrent))
-            self.stats_table.setItem(row_idx, 6, self._make_hours_item(est_usage_hours))
-            self.stats_table.setItem(row_idx, 7, QTableWidgetItem(first_seen))
-            self.stats_table.setItem(row_idx, 8, QTableWidgetItem(last_seen))
-
             if policy_max is not None:
-                self.stats_table.setItem(row_idx, 9, self._make_numeric_item(policy_max))
-
                 # Active Util. % = avg concurrent when in use / policy_max
                 if policy_max > 0:
                     active_util = avg_concurrent / policy_max * 100
                 else:
                     active_util = 0
-                au_item = QTableWidgetItem(f"{active_util:.1f}%")
-                if active_util >= 80:
-                    au_item.setBackground(QColor(144, 238, 144))  # green
-                elif active_util >= 30:
-                    au_item.setBackground(QColor(255, 255, 153))  # yellow
-                else:
-                    au_item.setBackground(QColor(255, 182, 182))  # red
-                self.stats_table.setItem(row_idx, 10, au_item)
-
                 # Period Util. % = usage_hours / (policy_max × period_hours) × 100
                 if policy_max > 0 and period_hours > 0:
                     period_util = est_usage_hours / (policy_max * period_hours) * 100
                 else:
                     period_util = 0
-                pu_item = QTableWidgetItem(f"{period_util:.1f}%")
-                if period_util >= 60:
-                    pu_item.setBackground(QColor(144, 238, 144))  # green
-                elif period_util >= 20:
-                    pu_item.setBackground(QColor(255, 255, 153))  # yellow
-                else:
-                    pu_item.setBackground(QColor(255, 182, 182))  # red
-                self.stats_table.setItem(row_idx, 11, pu_item)
             else:
-                self.stats_table.setItem(row_idx, 9, QTableWidgetItem("-"))
-                no_policy = QTableWidgetItem("No policy")
-                no_policy.setBackground(QColor(220, 220, 220))  # gray
-                self.stats_table.setItem(row_idx, 10, no_policy)
-                no_policy2 = QTableWidgetItem("No policy")
-                no_policy2.setBackground(QColor(220, 220, 220))
-                self.stats_table.setItem(row_idx, 11, no_policy2)
-
-        self.stats_table.resizeColumnsToContents()
+                active_util = period_util = None
+
+            rows.append((feat, total_checkouts, unique_users, active_days, avg_concurrent,
+                         peak_concurrent, est_usage_hours, first_seen, last_seen,
+                         policy_max, active_util, period_util))
+
+        stats = pd.DataFrame(rows, dtype=object)
+        au_colors = _UTIL_COLORS[util_color_bucket(stats[10].to_numpy(dtype=float), 80, 30)]
+        pu_colors = _UTIL_COLORS[util_color_bucket(stats[11].to_numpy(dtype=float), 60, 20)]
+
+        def util_text(v):
+            return "No policy" if v is None else f"{v:.1f}%"
+
+        with suspended_updates(self.stats_table):
+            self.stats_model.setDataFrame(
+                stats,
+                formats={
+                    6: _hours_text,
+                    9: lambda v: "-" if v is None else v,
+                    10: util_text,
+                    11: util_text,
+                },
+                backgrounds={10: au_colors, 11: pu_colors},
+            )
+            self.stats_table.resizeColumnsToContents()
         self.stats_table.setSortingEnabled(True)
 
     # --------------------------------------------------------
@@ -2329,63 +2672,66 @@ class LicenseMonitorGUI(QMainWindow):
     # --------------------------------------------------------
     def _get_period_days(self):
         """Return number of days in the selected period (inclusive)."""
-        start_qd = self.start_date_edit.date()
-        end_qd = self.end_date_edit.date()
-        return max(start_qd.daysTo(end_qd) + 1, 1)
+        if self._cached_period_days is None:
+            start_qd = self.start_date_edit.date()
+            end_qd = self.end_date_edit.date()
+            self._cached_period_days = max(start_qd.daysTo(end_qd) + 1, 1)
+        return self._cached_period_days
 
     def _update_user_activity(self, df):
         self.user_activity_table.setSortingEnabled(False)
-        self.user_activity_table.setRowCount(0)
 
         if df.empty:
+            self.user_activity_model.clear()
             self.user_activity_table.setSortingEnabled(True)
             return
 
-        df = df.copy()
-        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
         interval_min = self._snapshot_interval_minutes()
         period_days = self._get_period_days()
 
-        users = sorted(df["user"].unique())
-        for row_idx, user in enumerate(users):
-            udf = df[df["user"] == user]
-            company = udf["company"].iloc[0]
-            features_used = udf["feature"].nunique()
-            total_checkouts = len(udf)
-            valid_dt = udf["datetime"].dropna()
-            active_days = valid_dt.dt.date.nunique() if not valid_dt.empty else 0
-            first_active = str(valid_dt.min()) if not valid_dt.empty else "-"
-            last_active = str(valid_dt.max()) if not valid_dt.empty else "-"
-
-            # Session-based usage: sum per-feature session durations
-            est_usage_hours = 0.0
-            total_sessions = 0
-            for feat in udf["feature"].unique():
-                uf_feat = udf[udf["feature"] == feat]
-                s_count, s_hours = self._compute_sessions(uf_feat["ts"], interval_min)
-                est_usage_hours += s_hours
-                total_sessions += s_count
-            est_usage_hours = round(est_usage_hours, 2)
+        # Session-based usage: per-(user, feature) sessions rolled up per user
+        per_user_sessions = (
+            self._session_stats(df, ["user", "feature"], interval_min)
+            .groupby(level="user", observed=True)
+            .agg(total_sessions=("sessions", "sum"), est_usage_hours=("hours", "sum"))
+        )
+
+        user_groups = df.groupby("user", observed=True)
+        summary = user_groups.agg(
+            company=("company", "first"),
+            features_used=("feature", "nunique"),
+            total_checkouts=("feature", "size"),
+            first_active=("datetime", "min"),
+            last_active=("datetime", "max"),
+        )
+        summary["active_days"] = df["datetime"].dt.normalize().groupby(df["user"], observed=True).nunique()
+        summary = summary.join(per_user_sessions).sort_index()
+
+        rows = []
+        for (user, company, features_used, total_checkouts, first_dt, last_dt,
+             active_days, total_sessions, est_usage_hours) in summary.itertuples(name=None):
+            features_used = int(features_used)
+            total_checkouts = int(total_checkouts)
+            active_days = int(active_days)
+            total_sessions = 0 if pd.isna(total_sessions) else int(total_sessions)
+            est_usage_hours = 0.0 if pd.isna(est_usage_hours) else round(float(est_usage_hours), 2)
+            first_active = str(first_dt) if pd.notna(first_dt) else "-"
+            last_active = str(last_dt) if pd.notna(last_dt) else "-"
 
             avg_hours_day = round(est_usage_hours / period_days, 2)
             avg_hours_day_copy = round(avg_hours_day / features_used, 2) if features_used > 0 else 0.0
             avg_session_hrs = round(est_usage_hours / total_sessions, 2) if total_sessions > 0 else 0.0
 
-            self.user_activity_table.insertRow(row_idx)
-            self.user_activity_table.setItem(row_idx, 0, QTableWidgetItem(user))
-            self.user_activity_table.setItem(row_idx, 1, QTableWidgetItem(company))
-            self.user_activity_table.setItem(row_idx, 2, self._make_numeric_item(features_used))
-            self.user_activity_table.setItem(row_idx, 3, self._make_numeric_item(total_checkouts))
-            self.user_activity_table.setItem(row_idx, 4, self._make_hours_item(est_usage_hours))
-            self.user_activity_table.setItem(row_idx, 5, self._make_numeric_item(active_days))
-            self.user_activity_table.setItem(row_idx, 6, QTableWidgetItem(first_active))
-            self.user_activity_table.setItem(row_idx, 7, QTableWidgetItem(last_active))
-            self.user_activity_table.setItem(row_idx, 8, self._make_hours_item(avg_hours_day))
-            self.user_activity_table.setItem(row_idx, 9, self._make_hours_item(avg_hours_day_copy))
-            self.user_activity_table.setItem(row_idx, 10, self._make_numeric_item(total_sessions))
-            self.user_activity_table.setItem(row_idx, 11, self._make_hours_item(avg_session_hrs))
-
-        self.user_activity_table.resizeColumnsToContents()
+            rows.append((user, company, features_used, total_checkouts, est_usage_hours,
+                         active_days, first_active, last_active, avg_hours_day,
+                         avg_hours_day_copy, total_sessions, avg_session_hrs))
+
+        with suspended_updates(self.user_activity_table):
+            self.user_activity_model.setDataFrame(
+                pd.DataFrame(rows, dtype=object),
+                formats={col: _hours_text for col in (4, 8, 9, 11)},
+            )
+            self.user_activity_table.resizeColumnsToContents()
         self.user_activity_table.setSortingEnabled(True)
 
     # --------------------------------------------------------
@@ -2393,32 +2739,19 @@ class LicenseMonitorGUI(QMainWindow):
     # --------------------------------------------------------
     def _update_details(self, df):
         self.detail_table.setSortingEnabled(False)
-        self.detail_table.setRowCount(0)
 
         if df.empty:
+            self.detail_model.clear()
             self.detail_table.setSortingEnabled(True)
             return
 
-        max_rows = 10000
-        display = df.head(max_rows)
-
-        for idx, (_, row) in enumerate(display.iterrows()):
-            self.detail_table.insertRow(idx)
-            self.detail_table.setItem(idx, 0, QTableWidgetItem(str(row["ts"])))
-            self.detail_table.setItem(idx, 1, QTableWidgetItem(str(row["feature"])))
-            self.detail_table.setItem(idx, 2, QTableWidgetItem(str(row["user"])))
-            self.detail_table.setItem(idx, 3, QTableWidgetItem(str(row["company"])))
-            self.detail_table.setItem(idx, 4, QTableWidgetItem(str(row.get("host", ""))))
-
-        self.detail_table.resizeColumnsToContents()
+        # The model only renders the rows Qt paints, so every row is shown
+        display = df.reindex(columns=["ts", "feature", "user", "company", "host"], fill_value="")
+        with suspended_updates(self.detail_table):
+            self.detail_model.setDataFrame(display)
+            self.detail_table.resizeColumnsToContents()
         self.detail_table.setSortingEnabled(True)
 
-        if len(df) > max_rows:
-            self.status_bar.showMessage(
-                self.status_bar.currentMessage() +
-                f"  (Details tab limited to {max_rows} of {len(df)} rows)"
-            )
-
     # --------------------------------------------------------
     # Export CSV
     # --------------------------------------------------------
@@ -2443,12 +2776,22 @@ class LicenseMonitorGUI(QMainWindow):
         if not file_path:
             return
 
-        try:
-            self.filtered_data.to_csv(file_path, index=False)
-            QMessageBox.information(self, "Exported", f"Data exported to:\n{file_path}")
-            self.status_bar.showMessage(f"Exported {len(self.filtered_data)} records to {file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Error", str(e))
+        self.export_btn.setEnabled(False)
+        self.status_bar.showMessage(f"Exporting {len(self.filtered_data)} records...")
+        self.csv_export_thread = CsvExportThread(
+            self.filtered_data.drop(columns="datetime", errors="ignore"), file_path)
+        self.csv_export_thread.export_complete.connect(self._on_csv_export_complete)
+        self.csv_export_thread.error_occurred.connect(self._on_csv_export_error)
+        self.csv_export_thread.start()
+
+    def _on_csv_export_complete(self, file_path, count):
+        self.export_btn.setEnabled(True)
+        QMessageBox.information(self, "Exported", f"Data exported to:\n{file_path}")
+        self.status_bar.showMessage(f"Exported {count} records to {file_path}")
+
+    def _on_csv_export_error(self, msg):
+        self.export_btn.setEnabled(True)
+        QMessageBox.critical(self, "Export Error", msg)
 
     # --------------------------------------------------------
     # Export HTML Report
@@ -2481,8 +2824,28 @@ class LicenseMonitorGUI(QMainWindow):
         return "custom", f"{start_date}_{end_date}"
 
     def _render_chart_to_base64(self, df, start_d, end_d, policy_map=None):
-        """Render usage trend chart to a base64-encoded PNG string."""
-        fig = Figure(figsize=(14, 5), dpi=120)
+        """Render usage trend chart to a base64-encoded PNG string.
+
+        Call from the GUI thread only: Matplotlib's Agg rendering (font
+        cache, text layout, mathtext) is not thread-safe, so charts are
+        rendered one at a time. Figures are reused from a pool across calls.
+        """
+        try:
+            fig, buf = self._report_figs.get_nowait()
+        except queue.Empty:
+            fig, buf = Figure(figsize=(14, 5), dpi=120), BytesIO()
+        try:
+            fig.clear()
+            self._draw_report_chart(fig, df, start_d, end_d, policy_map)
+            buf.seek(0)
+            buf.truncate()
+            fig.savefig(buf, format="png", bbox_inches="tight")
+            return base64.b64encode(buf.getvalue()).decode("ascii")
+        finally:
+            self._report_figs.put((fig, buf))
+
+    def _draw_report_chart(self, fig, df, start_d, end_d, policy_map=None):
+        """Draw the usage trend chart for df onto an empty Figure."""
         ax = fig.add_subplot(111)
 
         if df.empty:
@@ -2505,14 +2868,16 @@ class LicenseMonitorGUI(QMainWindow):
                 else:
                     agg["plot_dt"] = pd.to_datetime(agg["time_bin"])
 
-                features = sorted(agg["feature"].unique())
+                # One column per feature so all lines go through a single plot call
+                wide = agg.pivot_table(index="plot_dt", columns="feature", values="concurrent",
+                                       aggfunc="max", fill_value=0, observed=True).sort_index()
+                features = list(wide.columns)
+                x = wide.index.values
+                lines = ax.plot(x, wide.values, linewidth=1.5, drawstyle="steps-post")
                 feat_colors = {}
-                for feat in features:
-                    fdata = agg[agg["feature"] == feat].sort_values("plot_dt")
-                    x, y = fdata["plot_dt"], fdata["concurrent"]
-                    line, = ax.plot(x, y, linewidth=1.5, label=feat,
-                                    drawstyle="steps-post")
-                    ax.fill_between(x, y, alpha=0.15, color=line.get_color(),
+                for line, feat in zip(lines, features):
+                    line.set_label(feat)
+                    ax.fill_between(x, wide[feat].values, alpha=0.15, color=line.get_color(),
                                     step="post")
                     feat_colors[feat] = line.get_color()
 
@@ -2555,12 +2920,14 @@ class LicenseMonitorGUI(QMainWindow):
         ax.legend(loc="best", fontsize=8, ncol=2)
         fig.tight_layout()
 
-        buf = BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight")
-        buf.seek(0)
-        b64 = base64.b64encode(buf.read()).decode("ascii")
-        buf.close()
-        return b64
+    @staticmethod
+    def _build_report_context(df):
+        """Sorted features/companies/users of df, computed once per report section."""
+        return {
+            "features": sorted(df["feature"].unique()),
+            "companies": sorted(df["company"].unique()),
+            "users": sorted(df["user"].unique()),
+        }
 
     def _build_stats_rows(self, df, policy_map=None, period_hours=None):
         """Build per-feature statistics as a list of dicts."""
@@ -2568,31 +2935,35 @@ class LicenseMonitorGUI(QMainWindow):
             return []
 
         pmap = policy_map if policy_map is not None else self.policy_map
-        df = df.copy()
-        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
         interval_min = self._snapshot_interval_minutes()
         ph = period_hours if period_hours else 1.0
+
+        # One split-apply-combine pass per metric instead of slicing per feature
+        by_feat = df.groupby("feature", observed=True)
+        agg = by_feat.agg(
+            total_checkouts=("user", "size"),
+            unique_users=("user", "nunique"),
+            first_seen=("datetime", "min"),
+            last_seen=("datetime", "max"),
+        )
+        agg["active_days"] = df["datetime"].dt.normalize().groupby(df["feature"], observed=True).nunique()
+        conc = df.groupby(["feature", "ts"], observed=True).size().groupby(level="feature", observed=True).agg(["max", "mean"])
+        # Usage Hours: sum of per-user session durations for each feature
+        usage = (self._session_stats(df, ["feature", "user"], interval_min)["hours"]
+                 .groupby(level="feature", observed=True).sum())
+        agg = agg.join(conc).join(usage.rename("hours"))
+
         rows = []
-        for feat in sorted(df["feature"].unique()):
-            fdf = df[df["feature"] == feat]
-            total_checkouts = len(fdf)
-            unique_users = fdf["user"].nunique()
-            active_days = fdf["datetime"].dt.date.nunique()
-            concurrent_per_snap = fdf.groupby("ts").size()
-            peak_conc = int(concurrent_per_snap.max()) if not concurrent_per_snap.empty else 0
-            # Usage Hours: sum of per-user session durations for this feature
-            est_usage_hours = 0.0
-            for usr in fdf["user"].unique():
-                _, usr_hrs = self._compute_sessions(fdf[fdf["user"] == usr]["ts"], interval_min)
-                est_usage_hours += usr_hrs
-            est_usage_hours = round(est_usage_hours, 1)
+        for (feat, total_checkouts, unique_users, first_dt, last_dt, active_days,
+             peak_conc, mean_conc, hours) in agg.itertuples(name=None):
+            est_usage_hours = 0.0 if pd.isna(hours) else round(float(hours), 1)
             # Time-weighted avg concurrent over entire period
             avg_conc = round(est_usage_hours / ph, 2) if ph > 0 else 0
             # Avg concurrent when feature is actively checked out
-            avg_conc_active = round(float(concurrent_per_snap.mean()), 2) if not concurrent_per_snap.empty else 0
-            valid_dt = fdf["datetime"].dropna()
-            first_seen = str(valid_dt.min()) if not valid_dt.empty else "-"
-            last_seen = str(valid_dt.max()) if not valid_dt.empty else "-"
+            avg_conc_active = round(float(mean_conc), 2)
+            peak_conc = int(peak_conc)
+            first_seen = str(first_dt) if pd.notna(first_dt) else "-"
+            last_seen = str(last_dt) if pd.notna(last_dt) else "-"
             policy_max = pmap.get(feat)
             active_util = None
             period_util = None
@@ -2601,9 +2972,9 @@ class LicenseMonitorGUI(QMainWindow):
                 period_util = round(est_usage_hours / (policy_max * ph) * 100, 1)
             rows.append({
                 "feature": feat,
-                "total_checkouts": total_checkouts,
-                "unique_users": unique_users,
-                "active_days": active_days,
+                "total_checkouts": int(total_checkouts),
+                "unique_users": int(unique_users),
+                "active_days": int(active_days),
                 "avg_concurrent": avg_conc,
                 "peak_concurrent": peak_conc,
                 "est_usage_hours": est_usage_hours,
@@ -2615,7 +2986,7 @@ class LicenseMonitorGUI(QMainWindow):
             })
         return rows
 
-    def _build_overuse_analysis(self, df, policy_map=None):
+    def _build_overuse_analysis(self, df, policy_map=None, ctx=None):
         """Identify features where concurrent usage exceeded policy_max.
 
         Returns list of dicts with overuse details per feature, or empty list
@@ -2625,49 +2996,64 @@ class LicenseMonitorGUI(QMainWindow):
         if df.empty or not pmap:
             return []
 
-        df = df.copy()
-        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
         results = []
+        features = ctx["features"] if ctx else sorted(df["feature"].unique())
+
+        # Concurrent count per (feature, snapshot), compared against each
+        # feature's policy_max in one broadcast instead of per feature
+        snaps = (
+            df[df["feature"].isin(list(pmap))]
+            .groupby(["feature", "ts"], observed=True)
+            .agg(concurrent=("user", "size"), dt=("datetime", "first"))
+            .reset_index()
+        )
+        if snaps.empty:
+            return []
+        limits = snaps["feature"].astype(object).map(pmap).to_numpy(dtype=float)
+        snaps["over"] = snaps["concurrent"].to_numpy() > limits
+        snaps["over_dt"] = snaps["dt"].where(snaps["over"])
+        per_feat = snaps.groupby("feature", observed=True).agg(
+            total_snapshots=("concurrent", "size"),
+            over_snapshots=("over", "sum"),
+            peak_concurrent=("concurrent", "max"),
+            n_dt=("dt", "count"),
+            dt_min=("dt", "min"),
+            dt_max=("dt", "max"),
+            first_over=("over_dt", "min"),
+            last_over=("over_dt", "max"),
+        )
+        per_feat = per_feat[per_feat["over_snapshots"] > 0]
 
-        for feat in sorted(df["feature"].unique()):
-            policy_max = pmap.get(feat)
-            if policy_max is None:
-                continue
-
-            fdf = df[df["feature"] == feat]
-            snap_counts = fdf.groupby("ts").agg(
-                concurrent=("user", "size"),
-                dt=("datetime", "first"),
-            )
-
-            over = snap_counts[snap_counts["concurrent"] > policy_max]
-            if over.empty:
+        for feat in features:
+            if feat not in per_feat.index:
                 continue
-
-            total_snapshots = len(snap_counts)
-            over_snapshots = len(over)
-
-            # Estimate duration from snapshot intervals
-            all_times = sorted(snap_counts["dt"].dropna())
-            if len(all_times) >= 2:
-                avg_interval = (all_times[-1] - all_times[0]) / (len(all_times) - 1)
-                est_duration = avg_interval * over_snapshots
+            row = per_feat.loc[feat]
+            policy_max = pmap[feat]
+            total_snapshots = int(row["total_snapshots"])
+            over_snapshots = int(row["over_snapshots"])
+            peak = int(row["peak_concurrent"])
+
+            # Estimate duration from snapshot intervals (integer ns, no Timestamp boxing)
+            n_dt = int(row["n_dt"])
+            if n_dt >= 2:
+                avg_interval_ns = (row["dt_max"].value - row["dt_min"].value) // (n_dt - 1)
+                est_duration = pd.Timedelta(avg_interval_ns * over_snapshots, unit="ns")
                 dur_str = str(est_duration).split(".")[0]  # drop microseconds
             else:
                 dur_str = "N/A"
 
-            over_times = sorted(over["dt"].dropna())
+            first_over, last_over = row["first_over"], row["last_over"]
             results.append({
                 "feature": feat,
                 "policy_max": policy_max,
-                "peak_concurrent": int(snap_counts["concurrent"].max()),
+                "peak_concurrent": peak,
                 "over_snapshots": over_snapshots,
                 "total_snapshots": total_snapshots,
                 "over_pct": round(over_snapshots / total_snapshots * 100, 1),
                 "est_duration": dur_str,
-                "first_over": str(over_times[0]) if over_times else "N/A",
-                "last_over": str(over_times[-1]) if over_times else "N/A",
-                "max_excess": int(snap_counts["concurrent"].max()) - policy_max,
+                "first_over": str(pd.Timestamp(first_over.value)) if pd.notna(first_over) else "N/A",
+                "last_over": str(pd.Timestamp(last_over.value)) if pd.notna(last_over) else "N/A",
+                "max_excess": peak - policy_max,
             })
 
         return sorted(results, key=lambda r: r["over_pct"], reverse=True)
@@ -2677,117 +3063,105 @@ class LicenseMonitorGUI(QMainWindow):
         if df.empty:
             return []
         interval_min = self._snapshot_interval_minutes()
+
+        agg = df.groupby("company", observed=True).agg(
+            features_used=("feature", "nunique"),
+            total_checkouts=("user", "size"),
+            unique_users=("user", "nunique"),
+        )
+        agg["peak_concurrent"] = df.groupby(["company", "ts"], observed=True).size().groupby(level="company", observed=True).max()
+        # Session-based usage: sum per (user, feature) session durations
+        usage = (self._session_stats(df, ["company", "user", "feature"], interval_min)["hours"]
+                 .groupby(level="company", observed=True).sum())
+        agg = agg.join(usage.rename("hours"))
+
         rows = []
-        for comp in sorted(df["company"].unique()):
-            cdf = df[df["company"] == comp]
-            total_checkouts = len(cdf)
-            concurrent_per_snap = cdf.groupby("ts").size()
-            # Session-based usage: sum per (user, feature) session durations
-            est_usage_hours = 0.0
-            for usr in cdf["user"].unique():
-                udf = cdf[cdf["user"] == usr]
-                for feat in udf["feature"].unique():
-                    _, s_hrs = self._compute_sessions(udf[udf["feature"] == feat]["ts"], interval_min)
-                    est_usage_hours += s_hrs
-            est_usage_hours = round(est_usage_hours, 1)
+        for comp, features_used, total_checkouts, unique_users, peak, hours in agg.itertuples(name=None):
             rows.append({
                 "company": comp,
-                "features_used": cdf["feature"].nunique(),
-                "total_checkouts": total_checkouts,
-                "unique_users": cdf["user"].nunique(),
-                "peak_concurrent": int(concurrent_per_snap.max()) if not concurrent_per_snap.empty else 0,
-                "est_usage_hours": est_usage_hours,
+                "features_used": int(features_used),
+                "total_checkouts": int(total_checkouts),
+                "unique_users": int(unique_users),
+                "peak_concurrent": int(peak),
+                "est_usage_hours": 0.0 if pd.isna(hours) else round(float(hours), 1),
             })
         return sorted(rows, key=lambda r: r["total_checkouts"], reverse=True)
 
     def _build_feature_company_matrix(self, df):
-        """Build Feature x Company peak-concurrent cross-tab."""
+        """Build Feature x Company peak-concurrent pivot (features x companies)."""
         if df.empty:
-            return [], [], {}
-        features = sorted(df["feature"].unique())
-        companies = sorted(df["company"].unique())
-        matrix = {}
-        for feat in features:
-            matrix[feat] = {}
-            for comp in companies:
-                sub = df[(df["feature"] == feat) & (df["company"] == comp)]
-                if sub.empty:
-                    matrix[feat][comp] = 0
-                else:
-                    per_snap = sub.groupby("ts").size()
-                    matrix[feat][comp] = int(per_snap.max())
-        return features, companies, matrix
+            return pd.DataFrame()
+        per_snap = df.groupby(["ts", "feature", "company"], observed=True).size()
+        peak = per_snap.groupby(level=["feature", "company"], observed=True).max().unstack(fill_value=0)
+        peak = peak.loc[sorted(peak.index), sorted(peak.columns)].astype("int64")
+        peak.index = peak.index.astype(str)
+        peak.columns = peak.columns.astype(str)
+        return peak
+
+    def _build_user_aggregates(self, df):
+        """Per-user aggregates shared by the top-users and user-activity tables.
+
+        Returns a DataFrame indexed by user (sorted) with company, features_used,
+        total_checkouts, first_active, last_active, active_days, sessions, hours.
+        """
+        interval_min = self._snapshot_interval_minutes()
+        by_user = df.groupby("user", observed=True)
+        per_user = by_user.agg(
+            company=("company", "first"),
+            features_used=("feature", "nunique"),
+            total_checkouts=("user", "size"),
+            first_active=("datetime", "min"),
+            last_active=("datetime", "max"),
+        )
+        per_user["active_days"] = df["datetime"].dt.normalize().groupby(df["user"], observed=True).nunique()
+        # Session-based usage: per-feature sessions summed per user
+        return per_user.join(self._session_stats(df, ["user", "feature"], interval_min)
+                             .groupby(level="user", observed=True).sum())
 
-    def _build_top_users(self, df, n=20):
+    def _build_top_users(self, df, n=20, per_user=None):
         """Top N users by total checkouts."""
         if df.empty:
             return []
-        df = df.copy()
-        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
-        interval_min = self._snapshot_interval_minutes()
-        results = []
+        if per_user is None:
+            per_user = self._build_user_aggregates(df)
         user_stats = (
-            df.groupby("user")
-            .agg(
-                company=("company", "first"),
-                features_used=("feature", "nunique"),
-                total_checkouts=("user", "size"),
-            )
-            .reset_index()
+            per_user.reset_index()
             .sort_values("total_checkouts", ascending=False)
             .head(n)
         )
-        for _, row in user_stats.iterrows():
-            udf = df[df["user"] == row["user"]]
-            valid_dt = udf["datetime"].dropna()
-            active_days = valid_dt.dt.date.nunique() if not valid_dt.empty else 0
-            est_hours = 0.0
-            for feat in udf["feature"].unique():
-                _, s_hrs = self._compute_sessions(udf[udf["feature"] == feat]["ts"], interval_min)
-                est_hours += s_hrs
-            est_hours = round(est_hours, 1)
-            first_active = str(valid_dt.min()) if not valid_dt.empty else "-"
-            last_active = str(valid_dt.max()) if not valid_dt.empty else "-"
+
+        results = []
+        for (user, company, features_used, total_checkouts, first_dt, last_dt,
+             active_days, _sessions, hours) in user_stats.itertuples(index=False, name=None):
             results.append({
-                "user": row["user"],
-                "company": row["company"],
-                "features_used": row["features_used"],
-                "total_checkouts": row["total_checkouts"],
-                "est_usage_hours": est_hours,
-                "active_days": active_days,
-                "first_active": first_active,
-                "last_active": last_active,
+                "user": user,
+                "company": company,
+                "features_used": int(features_used),
+                "total_checkouts": int(total_checkouts),
+                "est_usage_hours": 0.0 if pd.isna(hours) else round(float(hours), 1),
+                "active_days": 0 if pd.isna(active_days) else int(active_days),
+                "first_active": str(first_dt) if pd.notna(first_dt) else "-",
+                "last_active": str(last_dt) if pd.notna(last_dt) else "-",
             })
         return results
 
-    def _build_user_activity(self, df):
+    def _build_user_activity(self, df, ctx=None, period_days=None, per_user=None):
         """Build per-user activity as a list of dicts for HTML export."""
         if df.empty:
             return []
-        df = df.copy()
-        df["datetime"] = pd.to_datetime(df["ts"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
-        interval_min = self._snapshot_interval_minutes()
-        period_days = self._get_period_days()
+        if period_days is None:
+            period_days = self._get_period_days()
+        users = ctx["users"] if ctx else sorted(df["user"].unique())
+        if per_user is None:
+            per_user = self._build_user_aggregates(df)
+        per_user = per_user.reindex(users)
+
         results = []
-        for user in sorted(df["user"].unique()):
-            udf = df[df["user"] == user]
-            company = udf["company"].iloc[0]
-            features_used = udf["feature"].nunique()
-            total_checkouts = len(udf)
-            valid_dt = udf["datetime"].dropna()
-            active_days = valid_dt.dt.date.nunique() if not valid_dt.empty else 0
-            first_active = str(valid_dt.min()) if not valid_dt.empty else "-"
-            last_active = str(valid_dt.max()) if not valid_dt.empty else "-"
-
-            # Session-based usage: sum per-feature session durations
-            est_hours = 0.0
-            total_sessions = 0
-            for feat in udf["feature"].unique():
-                uf_feat = udf[udf["feature"] == feat]
-                s_count, s_hours = self._compute_sessions(uf_feat["ts"], interval_min)
-                est_hours += s_hours
-                total_sessions += s_count
-            est_hours = round(est_hours, 1)
+        for (user, company, features_used, total_checkouts, first_dt, last_dt,
+             active_days, sessions, hours) in per_user.itertuples(name=None):
+            features_used = int(features_used)
+            total_sessions = 0 if pd.isna(sessions) else int(sessions)
+            est_hours = 0.0 if pd.isna(hours) else round(float(hours), 1)
 
             avg_hours_day = round(est_hours / period_days, 1)
             avg_hours_day_copy = round(avg_hours_day / features_used, 1) if features_used > 0 else 0.0
@@ -2796,11 +3170,11 @@ class LicenseMonitorGUI(QMainWindow):
                 "user": user,
                 "company": company,
                 "features_used": features_used,
-                "total_checkouts": total_checkouts,
+                "total_checkouts": int(total_checkouts),
                 "est_usage_hours": est_hours,
-                "active_days": active_days,
-                "first_active": first_active,
-                "last_active": last_active,
+                "active_days": 0 if pd.isna(active_days) else int(active_days),
+                "first_active": str(first_dt) if pd.notna(first_dt) else "-",
+                "last_active": str(last_dt) if pd.notna(last_dt) else "-",
                 "avg_hours_day": avg_hours_day,
                 "avg_hours_day_copy": avg_hours_day_copy,
                 "sessions": total_sessions,
@@ -2808,23 +3182,13 @@ class LicenseMonitorGUI(QMainWindow):
             })
         return sorted(results, key=lambda r: r["est_usage_hours"], reverse=True)
 
-    def _generate_html(self, chart_b64, stats, company_breakdown,
+    def _generate_html(self, out, chart_b64, stats, company_breakdown,
                        feat_comp_matrix, top_users, overuse,
                        user_activity, company_tabs, meta):
-        """Generate self-contained HTML report string with per-company tabs."""
-        features, companies, matrix = feat_comp_matrix
+        """Write the self-contained HTML report with per-company tabs to `out`."""
         now_str = meta["generated"]
         period_str = f"{meta['start_date']} to {meta['end_date']}"
 
-        def util_color(val):
-            if val is None:
-                return "#dcdcdc"
-            if val >= 80:
-                return "#90ee90"
-            if val >= 30:
-                return "#ffff99"
-            return "#ffb6b6"
-
         def _stats_table_html(stat_rows):
             """Render a feature-statistics table from a list of stat dicts."""
             parts = []
@@ -2833,32 +3197,23 @@ class LicenseMonitorGUI(QMainWindow):
 <th>Active Days</th><th>Avg When Active</th><th>Peak Concurrent</th>
 <th>Usage Hours</th><th>First Seen</th><th>Last Seen</th>
 <th>Policy Max</th><th>Active Util. %</th><th>Period Util. %</th></tr>""")
-            for s in stat_rows:
-                pm = str(s["policy_max"]) if s["policy_max"] is not None else "-"
-                euh = s.get("est_usage_hours", 0.0)
-                fs = s.get("first_seen", "-")
-                ls = s.get("last_seen", "-")
-                au = s.get("active_utilization")
-                if au is not None:
-                    auc = util_color(au)
-                    au_cell = (f'<td><span class="util-cell" style="background:{auc};">'
-                               f'{au:.1f}%</span></td>')
-                else:
-                    au_cell = '<td><span class="util-cell" style="background:#dcdcdc;">N/A</span></td>'
-                pu = s.get("period_utilization")
-                if pu is not None:
-                    puc = util_color(pu * 4 / 3)  # scale: 60%→green, 20%→yellow
-                    pu_cell = (f'<td><span class="util-cell" style="background:{puc};">'
-                               f'{pu:.1f}%</span></td>')
-                else:
-                    pu_cell = '<td><span class="util-cell" style="background:#dcdcdc;">N/A</span></td>'
-                parts.append(
-                    f'<tr><td>{s["feature"]}</td><td>{s["total_checkouts"]:,}</td>'
-                    f'<td>{s["unique_users"]}</td><td>{s["active_days"]}</td>'
-                    f'<td>{s["avg_concurrent"]}</td><td>{s["peak_concurrent"]}</td>'
-                    f'<td>{euh}</td><td>{fs}</td><td>{ls}</td>'
-                    f'<td>{pm}</td>{au_cell}{pu_cell}</tr>'
-                )
+            # Color classes for the whole table at once (None -> NaN -> gray)
+            aus = np.array([s.get("active_utilization") for s in stat_rows], dtype=float)
+            pus = np.array([s.get("period_utilization") for s in stat_rows], dtype=float)
+            au_colors = _UTIL_HEX[util_color_bucket(aus, 80, 30)]
+            pu_colors = _UTIL_HEX[util_color_bucket(pus * 4 / 3, 80, 30)]  # scale: 60%→green, 20%→yellow
+            for i, s in enumerate(stat_rows):
+                au = s["active_utilization"]
+                pu = s["period_utilization"]
+                parts.append(_ROW_FMT_STATS.format_map(dict(
+                    s,
+                    feature=_html_text(s["feature"]),
+                    policy_max=s["policy_max"] if s["policy_max"] is not None else "-",
+                    au_cell=(_UTIL_CELL_FMT.format(color=au_colors[i], text=f"{au:.1f}%")
+                             if au is not None else _UTIL_CELL_NA),
+                    pu_cell=(_UTIL_CELL_FMT.format(color=pu_colors[i], text=f"{pu:.1f}%")
+                             if pu is not None else _UTIL_CELL_NA),
+                )))
             parts.append("</table>")
             return "\n".join(parts)
 
@@ -2876,15 +3231,7 @@ class LicenseMonitorGUI(QMainWindow):
 <th>Overuse Snapshots</th><th>of Total</th><th>Overuse %</th>
 <th>Est. Duration</th><th>First Occurred</th><th>Last Occurred</th></tr>""")
                 for o in overuse_rows:
-                    parts.append(
-                        f'<tr class="over-highlight">'
-                        f'<td>{o["feature"]}</td><td>{o["policy_max"]}</td>'
-                        f'<td>{o["peak_concurrent"]}</td><td>+{o["max_excess"]}</td>'
-                        f'<td>{o["over_snapshots"]}</td><td>{o["total_snapshots"]}</td>'
-                        f'<td>{o["over_pct"]:.1f}%</td>'
-                        f'<td>{o["est_duration"]}</td>'
-                        f'<td>{o["first_over"]}</td><td>{o["last_over"]}</td></tr>'
-                    )
+                    parts.append(_ROW_FMT_OVERUSE.format_map(dict(o, feature=_html_text(o["feature"]))))
                 parts.append("</table>")
             else:
                 has_any_policy = any(s["policy_max"] is not None for s in stat_rows)
@@ -2905,77 +3252,36 @@ class LicenseMonitorGUI(QMainWindow):
 <tr><th>#</th><th>User</th><th>Company</th><th>Features Used</th>
 <th>Total Checkouts</th><th>Usage Hours</th><th>Active Days</th>
 <th>First Active</th><th>Last Active</th></tr>""")
-            for i, u in enumerate(user_rows, 1):
-                parts.append(
-                    f'<tr><td>{i}</td><td>{u["user"]}</td><td>{u["company"]}</td>'
-                    f'<td>{u["features_used"]}</td><td>{u["total_checkouts"]:,}</td>'
-                    f'<td>{u.get("est_usage_hours", 0.0)}</td>'
-                    f'<td>{u.get("active_days", 0)}</td>'
-                    f'<td>{u.get("first_active", "-")}</td>'
-                    f'<td>{u.get("last_active", "-")}</td></tr>'
-                )
+            top = pd.DataFrame(user_rows)
+            parts.append(_html_rows([
+                _plain_cells(pd.Series(range(1, len(top) + 1))),
+                _text_cells(top["user"]), _text_cells(top["company"]),
+                _plain_cells(top["features_used"]), _plain_cells(top["total_checkouts"], "{:,}".format),
+                _plain_cells(top["est_usage_hours"]), _plain_cells(top["active_days"]),
+                _plain_cells(top["first_active"]), _plain_cells(top["last_active"]),
+            ]))
             parts.append("</table>")
             return "\n".join(parts)
 
         # --- Build tab IDs ---
         tab_ids = ["overall"] + [f"comp_{i}" for i in range(len(company_tabs))]
-        tab_labels = ["Overall"] + list(company_tabs.keys())
+        tab_labels = ["Overall"] + [_html_text(c) for c in company_tabs]
+
+        # --- Write HTML ---
+        w = out.write
+
+        def emit(fragment):
+            w(fragment)
+            w("\n")
 
-        # --- Build HTML ---
-        h = []
-        h.append(f"""<!DOCTYPE html>
+        emit(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>License Usage Report — {period_str}</title>
 <style>
-  body {{ font-family: 'Segoe UI', Arial, sans-serif; margin: 20px 40px;
-         color: #222; background: #fafafa; }}
-  h1 {{ color: #1a3a5c; border-bottom: 3px solid #1a3a5c; padding-bottom: 8px; }}
-  h2 {{ color: #2a5a8c; margin-top: 36px; border-bottom: 1px solid #ccc;
-        padding-bottom: 4px; }}
-  .summary-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                   gap: 12px; margin: 16px 0; }}
-  .summary-card {{ background: #fff; border: 1px solid #ddd; border-radius: 6px;
-                   padding: 14px; text-align: center; }}
-  .summary-card .label {{ font-size: 0.85em; color: #666; }}
-  .summary-card .value {{ font-size: 1.6em; font-weight: bold; color: #1a3a5c; }}
-  table {{ border-collapse: collapse; width: 100%; margin: 12px 0; font-size: 0.92em; }}
-  th {{ background: #1a3a5c; color: #fff; padding: 8px 10px; text-align: left; }}
-  td {{ padding: 6px 10px; border-bottom: 1px solid #ddd; }}
-  tr:nth-child(even) {{ background: #f4f7fa; }}
-  tr:hover {{ background: #e8eef5; }}
-  .chart-container {{ text-align: center; margin: 16px 0; }}
-  .chart-container img {{ max-width: 100%; border: 1px solid #ccc; border-radius: 4px; }}
-  .util-cell {{ font-weight: bold; padding: 4px 8px; border-radius: 3px; text-align: center; }}
-  .alert-banner {{ background: #fff3cd; border: 1px solid #ffc107; border-radius: 6px;
-                   padding: 12px 16px; margin: 16px 0; color: #856404; }}
-  .alert-banner h3 {{ margin: 0 0 6px 0; color: #856404; }}
-  .over-highlight {{ background: #ffe0e0; font-weight: bold; }}
-  .tab-bar {{ display: flex; flex-wrap: wrap; gap: 0; margin-top: 24px;
-              border-bottom: 3px solid #1a3a5c;
-              position: sticky; top: 0; z-index: 100;
-              background: #fff; padding-top: 8px; }}
-  .tab-btn {{ padding: 10px 22px; cursor: pointer; background: #e8eef5;
-              border: 1px solid #ccc; border-bottom: none; border-radius: 6px 6px 0 0;
-              font-size: 0.95em; font-weight: bold; color: #1a3a5c;
-              margin-right: 2px; transition: background 0.15s; }}
-  .tab-btn:hover {{ background: #d0dced; }}
-  .tab-btn.active {{ background: #1a3a5c; color: #fff; border-color: #1a3a5c; }}
-  .tab-content {{ display: none; padding: 16px 0; }}
-  .tab-content.active {{ display: block; }}
-  .footer {{ margin-top: 40px; padding-top: 10px; border-top: 1px solid #ccc;
-             font-size: 0.82em; color: #888; }}
-  @media print {{
-    body {{ margin: 10px; }}
-    .summary-card {{ break-inside: avoid; }}
-    table {{ page-break-inside: auto; }}
-    tr {{ page-break-inside: avoid; }}
-    .tab-bar {{ display: none; }}
-    .tab-content {{ display: block !important; page-break-before: always; }}
-  }}
-</style>
+{_REPORT_CSS}</style>
 </head>
 <body>
 <h1>License Usage Audit Report</h1>
@@ -2984,17 +3290,17 @@ class LicenseMonitorGUI(QMainWindow):
 """)
 
         # --- Tab bar ---
-        h.append('<div class="tab-bar">')
+        emit('<div class="tab-bar">')
         for idx, label in enumerate(tab_labels):
             active = " active" if idx == 0 else ""
-            h.append(f'<div class="tab-btn{active}" onclick="switchTab(\'{tab_ids[idx]}\')">{label}</div>')
-        h.append("</div>")
+            emit(f'<div class="tab-btn{active}" onclick="switchTab(\'{tab_ids[idx]}\')">{label}</div>')
+        emit("</div>")
 
         # ===================== OVERALL TAB =====================
-        h.append('<div id="overall" class="tab-content active">')
+        emit('<div id="overall" class="tab-content active">')
 
         # Executive Summary
-        h.append('<h2>Executive Summary</h2><div class="summary-grid">')
+        emit('<h2>Executive Summary</h2><div class="summary-grid">')
         for label, value in [
             ("Period", period_str),
             ("Total Checkouts", f"{meta['total_records']:,}"),
@@ -3002,148 +3308,129 @@ class LicenseMonitorGUI(QMainWindow):
             ("Companies", meta["unique_companies"]),
             ("Unique Users", meta["unique_users"]),
         ]:
-            h.append(
+            emit(
                 f'<div class="summary-card"><div class="label">{label}</div>'
                 f'<div class="value">{value}</div></div>'
             )
-        h.append("</div>")
+        emit("</div>")
 
         # Chart
-        h.append(f'<h2>Usage Trend</h2><div class="chart-container">'
-                 f'<img src="data:image/png;base64,{chart_b64}" alt="Usage Trend Chart"/></div>')
+        emit(f'<h2>Usage Trend</h2><div class="chart-container">'
+             f'<img src="data:image/png;base64,{chart_b64}" alt="Usage Trend Chart"/></div>')
 
         # Stats
-        h.append("<h2>Feature Statistics</h2>")
-        h.append(_stats_table_html(stats))
+        emit("<h2>Feature Statistics</h2>")
+        emit(_stats_table_html(stats))
 
         # Overuse
-        h.append(_overuse_html(overuse, stats))
+        emit(_overuse_html(overuse, stats))
 
         # Company Breakdown
-        h.append("""<h2>Company Breakdown</h2>
+        emit("""<h2>Company Breakdown</h2>
 <table>
 <tr><th>Company</th><th>Features Used</th><th>Total Checkouts</th>
 <th>Unique Users</th><th>Peak Concurrent</th><th>Usage Hours</th></tr>""")
-        for c in company_breakdown:
-            h.append(
-                f'<tr><td>{c["company"]}</td><td>{c["features_used"]}</td>'
-                f'<td>{c["total_checkouts"]:,}</td><td>{c["unique_users"]}</td>'
-                f'<td>{c["peak_concurrent"]}</td><td>{c.get("est_usage_hours", 0.0)}</td></tr>'
-            )
-        h.append("</table>")
+        if company_breakdown:
+            cb = pd.DataFrame(company_breakdown)
+            emit(_html_rows([
+                _text_cells(cb["company"]), _plain_cells(cb["features_used"]),
+                _plain_cells(cb["total_checkouts"], "{:,}".format), _plain_cells(cb["unique_users"]),
+                _plain_cells(cb["peak_concurrent"]), _plain_cells(cb["est_usage_hours"]),
+            ]))
+        emit("</table>")
 
         # Feature x Company Matrix
-        if features and companies:
-            h.append('<h2>Feature &times; Company Matrix (Peak Concurrent)</h2>'
-                     '<table><tr><th>Feature</th>')
-            for comp in companies:
-                h.append(f"<th>{comp}</th>")
-            h.append("<th>Total</th></tr>")
-            for feat in features:
-                h.append(f'<tr><td><b>{feat}</b></td>')
-                row_total = 0
-                for comp in companies:
-                    val = matrix[feat][comp]
-                    row_total += val
-                    h.append(f'<td>{val if val > 0 else "-"}</td>')
-                h.append(f"<td><b>{row_total}</b></td></tr>")
-            h.append("<tr><td><b>Total</b></td>")
-            grand = 0
-            for comp in companies:
-                col_sum = sum(matrix[f][comp] for f in features)
-                grand += col_sum
-                h.append(f"<td><b>{col_sum}</b></td>")
-            h.append(f"<td><b>{grand}</b></td></tr></table>")
+        if not feat_comp_matrix.empty:
+            row_totals = feat_comp_matrix.sum(axis=1).to_numpy()
+            col_totals = feat_comp_matrix.sum(axis=0).to_numpy()
+            emit('<h2>Feature &times; Company Matrix (Peak Concurrent)</h2>'
+                 '<table><tr><th>Feature</th>')
+            for comp in feat_comp_matrix.columns:
+                emit(f"<th>{_html_text(comp)}</th>")
+            emit("<th>Total</th></tr>")
+            for feat, values, row_total in zip(feat_comp_matrix.index,
+                                               feat_comp_matrix.to_numpy(), row_totals):
+                emit(f'<tr><td><b>{_html_text(feat)}</b></td>')
+                for val in values:
+                    emit(f'<td>{val if val > 0 else "-"}</td>')
+                emit(f"<td><b>{row_total}</b></td></tr>")
+            emit("<tr><td><b>Total</b></td>")
+            for col_sum in col_totals:
+                emit(f"<td><b>{col_sum}</b></td>")
+            emit(f"<td><b>{col_totals.sum()}</b></td></tr></table>")
 
         # Top Users
-        h.append(_top_users_html(top_users))
+        emit(_top_users_html(top_users))
 
         # User Activity
         if user_activity:
-            h.append("""<h2>User Activity</h2>
+            emit("""<h2>User Activity</h2>
 <table>
 <tr><th>User</th><th>Company</th><th>Features Used</th><th>Total Checkouts</th>
 <th>Usage Hours</th><th>Active Days</th><th>First Active</th>
 <th>Last Active</th><th>Avg Hrs/Day</th><th>Avg Hrs/Day/Copy</th>
 <th>Sessions</th><th>Avg Session Hrs</th></tr>""")
-            for ua in user_activity:
-                h.append(
-                    f'<tr><td>{ua["user"]}</td><td>{ua["company"]}</td>'
-                    f'<td>{ua["features_used"]}</td><td>{ua["total_checkouts"]:,}</td>'
-                    f'<td>{ua["est_usage_hours"]}</td><td>{ua["active_days"]}</td>'
-                    f'<td>{ua["first_active"]}</td><td>{ua["last_active"]}</td>'
-                    f'<td>{ua["avg_hours_day"]}</td>'
-                    f'<td>{ua.get("avg_hours_day_copy", 0.0)}</td>'
-                    f'<td>{ua.get("sessions", 0)}</td>'
-                    f'<td>{ua.get("avg_session_hrs", 0.0)}</td></tr>'
-                )
-            h.append("</table>")
-
-        h.append("</div>")  # end overall tab
+            ua = pd.DataFrame(user_activity)
+            emit(_html_rows([
+                _text_cells(ua["user"]), _text_cells(ua["company"]),
+                _plain_cells(ua["features_used"]), _plain_cells(ua["total_checkouts"], "{:,}".format),
+                _plain_cells(ua["est_usage_hours"]), _plain_cells(ua["active_days"]),
+                _plain_cells(ua["first_active"]), _plain_cells(ua["last_active"]),
+                _plain_cells(ua["avg_hours_day"]), _plain_cells(ua["avg_hours_day_copy"]),
+                _plain_cells(ua["sessions"]), _plain_cells(ua["avg_session_hrs"]),
+            ]))
+            emit("</table>")
+
+        emit("</div>")  # end overall tab
 
         # ===================== COMPANY TABS =====================
         for idx, (comp_name, cdata) in enumerate(company_tabs.items()):
+            comp_name = _html_text(comp_name)
             tab_id = f"comp_{idx}"
-            h.append(f'<div id="{tab_id}" class="tab-content">')
-            h.append(f"<h2>{comp_name} — Summary</h2>")
+            emit(f'<div id="{tab_id}" class="tab-content">')
+            emit(f"<h2>{comp_name} — Summary</h2>")
 
             # Mini summary cards
-            h.append('<div class="summary-grid">')
+            emit('<div class="summary-grid">')
             for label, value in [
                 ("Company", comp_name),
                 ("Total Checkouts", f"{cdata['total_records']:,}"),
                 ("Features Used", cdata["unique_features"]),
                 ("Unique Users", cdata["unique_users"]),
             ]:
-                h.append(
+                emit(
                     f'<div class="summary-card"><div class="label">{label}</div>'
                     f'<div class="value">{value}</div></div>'
                 )
-            h.append("</div>")
+            emit("</div>")
 
             # Company chart
-            h.append(f'<h2>{comp_name} — Usage Trend</h2><div class="chart-container">'
-                     f'<img src="data:image/png;base64,{cdata["chart_b64"]}" '
-                     f'alt="{comp_name} Usage Trend"/></div>')
+            emit(f'<h2>{comp_name} — Usage Trend</h2><div class="chart-container">'
+                 f'<img src="data:image/png;base64,{cdata["chart_b64"]}" '
+                 f'alt="{comp_name} Usage Trend"/></div>')
 
             # Company stats
-            h.append(f"<h2>{comp_name} — Feature Statistics</h2>")
-            h.append(_stats_table_html(cdata["stats"]))
+            emit(f"<h2>{comp_name} — Feature Statistics</h2>")
+            emit(_stats_table_html(cdata["stats"]))
 
             # Company overuse
-            h.append(_overuse_html(cdata["overuse"], cdata["stats"]))
+            emit(_overuse_html(cdata["overuse"], cdata["stats"]))
 
             # Company top users
-            h.append(_top_users_html(cdata["top_users"]))
+            emit(_top_users_html(cdata["top_users"]))
 
-            h.append("</div>")  # end company tab
+            emit("</div>")  # end company tab
 
         # ===================== FOOTER & JS =====================
-        h.append(f"""
+        w(f"""
 <div class="footer">
 License Monitor Audit Report &mdash; Generated {now_str}<br>
-Source: {str(BASE_DIR)}
+Source: {_html_text(BASE_DIR)}
 </div>
 <script>
-function switchTab(tabId) {{
-  document.querySelectorAll('.tab-content').forEach(function(el) {{
-    el.classList.remove('active');
-  }});
-  document.querySelectorAll('.tab-btn').forEach(function(el) {{
-    el.classList.remove('active');
-  }});
-  document.getElementById(tabId).classList.add('active');
-  var btns = document.querySelectorAll('.tab-btn');
-  var ids = {str(tab_ids)};
-  for (var i = 0; i < ids.length; i++) {{
-    if (ids[i] === tabId) {{ btns[i].classList.add('active'); break; }}
-  }}
-}}
-</script>
+{_REPORT_JS_TEMPLATE.substitute(tab_ids=tab_ids)}</script>
 </body></html>""")
 
-        return "\n".join(h)
-
     def _export_html(self):
         """Export a self-contained HTML audit report."""
         if self.filtered_data is None or self.filtered_data.empty:
@@ -3174,7 +3461,8 @@ function switchTab(tabId) {{
 
         try:
             df = self.filtered_data
-            num_companies = df["company"].nunique()
+            ctx = self._build_report_context(df)
+            num_companies = len(ctx["companies"])
 
             # Calculate total steps: 8 overall steps + 4 steps per company + 1 final write
             total_steps = 8 + (num_companies * 4) + 1
@@ -3190,79 +3478,120 @@ function switchTab(tabId) {{
 
             # --- Overall data (policy scoped to filtered users) ---
             period_hours = self._get_period_hours()
-            all_users = set(df["user"].unique())
-            overall_policy = self._policy_map_for_users(all_users)
-
-            update_progress("rendering overall chart")
-            chart_b64 = self._render_chart_to_base64(df, start_d, end_d, overall_policy)
-
-            update_progress("building statistics")
-            stats = self._build_stats_rows(df, overall_policy, period_hours)
-
-            update_progress("analyzing overuse")
-            overuse = self._build_overuse_analysis(df, overall_policy)
-
-            update_progress("building company breakdown")
-            company_bd = self._build_company_breakdown(df)
+            period_days = self._get_period_days()
+            self._snapshot_interval_minutes()  # detect/cache on this thread before workers read it
+            all_users = set(ctx["users"])
+            # Scan policy_rows once; per-company maps are built from this slice
+            policy_by_user = {}
+            for row in self.policy_rows:
+                if row[0] in all_users:
+                    policy_by_user.setdefault(row[0], []).append(row)
+            overall_policy = self._policy_map_for_users(
+                rows=[row for rows in policy_by_user.values() for row in rows])
+
+            # The pandas builders are independent, so they overlap on a thread pool
+            # while this thread renders the charts one by one (Agg is not
+            # thread-safe); results are collected below in the original progress order.
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                f_stats = pool.submit(self._build_stats_rows, df, overall_policy, period_hours)
+                f_overuse = pool.submit(self._build_overuse_analysis, df, overall_policy, ctx)
+                f_company = pool.submit(self._build_company_breakdown, df)
+                f_matrix = pool.submit(self._build_feature_company_matrix, df)
+                # Top users and user activity slice the same per-user groupby
+                f_users = pool.submit(self._build_user_aggregates, df)
+                f_top = pool.submit(lambda: self._build_top_users(df, per_user=f_users.result()))
+                f_activity = pool.submit(
+                    lambda: self._build_user_activity(df, ctx, period_days, per_user=f_users.result()))
+
+                # --- Per-company data (policy scoped to company users) ---
+                comp_jobs = []
+                # Per-company feature/user lists from one grouped pass, not a unique() scan per company
+                by_company = df.groupby("company", sort=True, observed=True)
+                comp_features = by_company["feature"].unique()
+                comp_users = by_company["user"].unique()
+                for comp, cdf in by_company:
+                    cctx = {
+                        "features": sorted(comp_features[comp]),
+                        "companies": [comp],
+                        "users": sorted(comp_users[comp]),
+                    }
+                    comp_policy = self._policy_map_for_users(
+                        rows=[row for user in cctx["users"] for row in policy_by_user.get(user, ())])
+                    comp_jobs.append((
+                        comp, cdf, cctx, comp_policy,
+                        pool.submit(self._build_stats_rows, cdf, comp_policy, period_hours),
+                        pool.submit(self._build_overuse_analysis, cdf, comp_policy, cctx),
+                        pool.submit(self._build_top_users, cdf),
+                    ))
+
+                update_progress("rendering overall chart")
+                chart_b64 = self._render_chart_to_base64(df, start_d, end_d, overall_policy)
+
+                update_progress("building statistics")
+                stats = f_stats.result()
+
+                update_progress("analyzing overuse")
+                overuse = f_overuse.result()
+
+                update_progress("building company breakdown")
+                company_bd = f_company.result()
+
+                update_progress("building feature matrix")
+                feat_comp = f_matrix.result()
+
+                update_progress("finding top users")
+                top_users = f_top.result()
+
+                update_progress("building user activity")
+                user_activity = f_activity.result()
+
+                update_progress("preparing metadata")
+                meta = {
+                    "generated": now.strftime("%Y-%m-%d %H:%M:%S"),
+                    "start_date": str(start_d),
+                    "end_date": str(end_d),
+                    "period_type": period_type,
+                    "ordinal": ordinal,
+                    "total_records": len(df),
+                    "unique_features": len(ctx["features"]),
+                    "unique_companies": num_companies,
+                    "unique_users": len(ctx["users"]),
+                }
 
-            update_progress("building feature matrix")
-            feat_comp = self._build_feature_company_matrix(df)
+                company_tabs = {}
+                for idx, (comp, cdf, cctx, comp_policy, f_cstats, f_coveruse,
+                          f_ctop) in enumerate(comp_jobs, 1):
+                    update_progress(f"[{idx}/{num_companies}] {comp} chart")
+                    comp_chart = self._render_chart_to_base64(cdf, start_d, end_d, comp_policy)
 
-            update_progress("finding top users")
-            top_users = self._build_top_users(df)
+                    update_progress(f"[{idx}/{num_companies}] {comp} stats")
+                    comp_stats = f_cstats.result()
 
-            update_progress("building user activity")
-            user_activity = self._build_user_activity(df)
+                    update_progress(f"[{idx}/{num_companies}] {comp} overuse")
+                    comp_overuse = f_coveruse.result()
 
-            update_progress("preparing metadata")
-            meta = {
-                "generated": now.strftime("%Y-%m-%d %H:%M:%S"),
-                "start_date": str(start_d),
-                "end_date": str(end_d),
-                "period_type": period_type,
-                "ordinal": ordinal,
-                "total_records": len(df),
-                "unique_features": df["feature"].nunique(),
-                "unique_companies": df["company"].nunique(),
-                "unique_users": df["user"].nunique(),
-            }
+                    update_progress(f"[{idx}/{num_companies}] {comp} top users")
+                    comp_top = f_ctop.result()
 
-            # --- Per-company data (policy scoped to company users) ---
-            company_tabs = {}
-            for idx, comp in enumerate(sorted(df["company"].unique()), 1):
-                cdf = df[df["company"] == comp]
-                comp_users = set(cdf["user"].unique())
-                comp_policy = self._policy_map_for_users(comp_users)
-
-                update_progress(f"[{idx}/{num_companies}] {comp} chart")
-                comp_chart = self._render_chart_to_base64(cdf, start_d, end_d, comp_policy)
-
-                update_progress(f"[{idx}/{num_companies}] {comp} stats")
-                comp_stats = self._build_stats_rows(cdf, comp_policy, period_hours)
-
-                update_progress(f"[{idx}/{num_companies}] {comp} overuse")
-                comp_overuse = self._build_overuse_analysis(cdf, comp_policy)
-
-                update_progress(f"[{idx}/{num_companies}] {comp} top users")
-                comp_top = self._build_top_users(cdf)
-
-                company_tabs[comp] = {
-                    "chart_b64": comp_chart,
-                    "stats": comp_stats,
-                    "overuse": comp_overuse,
-                    "top_users": comp_top,
-                    "total_records": len(cdf),
-                    "unique_features": cdf["feature"].nunique(),
-                    "unique_users": cdf["user"].nunique(),
-                }
+                    company_tabs[comp] = {
+                        "chart_b64": comp_chart,
+                        "stats": comp_stats,
+                        "overuse": comp_overuse,
+                        "top_users": comp_top,
+                        "total_records": len(cdf),
+                        "unique_features": len(cctx["features"]),
+                        "unique_users": len(cctx["users"]),
+                    }
 
             update_progress("generating HTML")
-            html = self._generate_html(chart_b64, stats, company_bd,
-                                       feat_comp, top_users, overuse,
-                                       user_activity, company_tabs, meta)
-
-            with open(export_path, "w", encoding="utf-8") as f:
-                f.write(html)
+            try:
+                with open(export_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                    self._generate_html(f, chart_b64, stats, company_bd,
+                                        feat_comp, top_users, overuse,
+                                        user_activity, company_tabs, meta)
+            except Exception:
+                export_path.unlink(missing_ok=True)  # don't leave a truncated report behind
+                raise
 
             # Track last export and enable View button
             self.last_exported_html = str(export_path)
@@ -3293,9 +3622,11 @@ function switchTab(tabId) {{
             self.view_html_btn.setEnabled(False)
             return
 
-        html_files = sorted(EXPORT_DIR.glob("*.html"), key=lambda p: p.stat().st_mtime, reverse=True)
+        # (path, mtime) pairs, newest first; each file is stat'd once
+        entries = [(p, p.stat().st_mtime) for p in EXPORT_DIR.glob("*.html")]
+        entries.sort(key=lambda e: e[1], reverse=True)
 
-        if not html_files:
+        if not entries:
             QMessageBox.warning(
                 self, "No Exports",
                 f"No HTML reports found in:\n{EXPORT_DIR}\n\nClick 'Export HTML' first."
@@ -3305,11 +3636,11 @@ function switchTab(tabId) {{
             return
 
         # If only one file, open it directly
-        if len(html_files) == 1:
-            selected_file = html_files[0]
+        if len(entries) == 1:
+            selected_file = entries[0][0]
         else:
             # Show file selection dialog
-            selected_file = self._select_html_file(html_files)
+            selected_file = self._select_html_file(entries)
             if not selected_file:
                 return  # User cancelled
 
@@ -3327,11 +3658,11 @@ function switchTab(tabId) {{
                 f"You can manually open:\n{selected_file}"
             )
 
-    def _select_html_file(self, html_files):
+    def _select_html_file(self, entries):
         """Show a dialog to select which HTML file to open.
 
         Args:
-            html_files: List of Path objects for HTML files
+            entries: List of (Path, mtime) tuples for HTML files, newest first
 
         Returns:
             Path object of selected file, or None if cancelled
@@ -3346,15 +3677,14 @@ function switchTab(tabId) {{
         layout = QVBoxLayout()
 
         # Info label
-        info_label = QLabel(f"Found {len(html_files)} HTML report(s). Select one to open:")
+        info_label = QLabel(f"Found {len(entries)} HTML report(s). Select one to open:")
         layout.addWidget(info_label)
 
         # File list
         file_list = QListWidget()
-        for html_file in html_files:
+        for html_file, mtime in entries:
             # Format: filename (modified: 2026-02-12 15:30:45)
-            mtime = datetime.fromtimestamp(html_file.stat().st_mtime)
-            display_text = f"{html_file.name}  (modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')})"
+            display_text = f"{html_file.name}  (modified: {datetime.fromtimestamp(mtime):%Y-%m-%d %H:%M:%S})"
             item = QListWidgetItem(display_text)
             item.setData(Qt.UserRole, html_file)  # Store Path object
             file_list.addItem(item)
@@ -3424,7 +3754,7 @@ def generate_license_key(expiry_date_str, machine_short, secret=_LICENSE_SECRET)
 
     # Generate HMAC signature
     sig_data = f"{expiry_str}:{ms}".encode()
-    sig = _hmac.new(secret, sig_data, hashlib.sha256).hexdigest()[:8].upper()
+    sig = _license_signature(sig_data, secret)
 
     return f"LMON-{expiry_str}-{ms}-{sig}"
 
@@ -3437,6 +3767,10 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
+    # Compile the session kernel up front instead of on the first Analyze
+    _session_kernel(np.zeros(2, dtype=np.int64), 1.0)
+    _grouped_session_kernel(np.zeros(1, dtype=np.int64), np.zeros(2, dtype=np.int64), 1.0)
+
     # License check: trial period or key validation
     lm = LicenseManager()
     status, msg = lm.check()
@@ -14,16 +14,29 @@ DB_PATH = os.path.join(os.environ["DB_DIR"], "license_monitor.db")
 # external partner user naming: company-xxxx
 USER_RE = re.compile(r"^[a-z0-9]+-[a-z]{4}$")
 
+# One pass per line: either a feature header ("Users of <feature>: ...") or a
+# checkout line ("    <user> <host> ... start <date>"). Quoted metadata lines
+# and anything without " start " fall through as no match.
+LINE_RE = re.compile(
+    r'^(?:Users of (?=.*\S)(?P<feat>[^:]*)'
+    r'|(?=.* start \s*\S)\s*(?P<user>[^\s"]\S*)\s+(?P<host>\S+))'
+)
+
 conn = sqlite3.connect(DB_PATH)
+# WAL lets the GUI keep reading while we write; mmap/cache cut read syscalls
+for pragma in ("journal_mode=WAL", "synchronous=NORMAL",
+               "mmap_size=268435456", "cache_size=-65536",
+               "temp_store=MEMORY"):
+    conn.execute(f"PRAGMA {pragma}")
 cur = conn.cursor()
 
 # Load policy users for filtering (fall back to USER_RE if empty)
-policy_users = set()
+policy_users = frozenset()
 try:
     cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='license_policy'")
     if cur.fetchone():
         cur.execute("SELECT DISTINCT user FROM license_policy")
-        policy_users = {r[0] for r in cur.fetchall()}
+        policy_users = frozenset(row[0] for row in cur)  # stream rows, no fetchall() list
 except Exception:
     pass
 
@@ -34,47 +47,55 @@ if not files:
 
 path = files[-1]
 ts = path.split("lmstat_", 1)[1].replace(".txt", "").replace("_", " ")
+source_file = os.path.basename(path)
 
 current_feature = None
+rows = []
+
+match_line = LINE_RE.match
+
+# With a policy loaded every checkout is kept; otherwise only partner-style
+# names pass. Decided once here instead of re-testing policy_users per line.
+if policy_users:
+    accept_user = None
+else:
+    match_user = USER_RE.match
+    accept_user = lambda u: "-" in u or match_user(u) is not None
 
 with open(path) as f:
-    for raw in f:
-        line = raw.rstrip()
+    for line in f:
+        m = match_line(line)
+        if not m:
+            continue
 
         # Feature header
-        if line.startswith("Users of "):
-            current_feature = line.split("Users of", 1)[1].split(":")[0].strip()
+        feat = m.group("feat")
+        if feat is not None:
+            current_feature = feat.strip()
             continue
 
         # Skip until a feature is active
         if not current_feature:
             continue
 
-        # Skip metadata / quoted lines
-        if not line.strip() or line.lstrip().startswith('"'):
-            continue
-
         # Real checkout line
-        if " start " in line:
-            parts = line.split()
-            if len(parts) < 2:
-                continue
-
-            user = parts[0]
-            host = parts[1]
-
-            # skip lines that don't look like real user checkouts
-            if not policy_users and not USER_RE.match(user) and "-" not in user:
-                continue
-
-            cur.execute(
-                """
-                INSERT INTO lmstat_snapshot
-                  (ts, user, host, feature, count, source_file)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (ts, user, host, current_feature, 1, os.path.basename(path))
-            )
+        user = m.group("user")
+
+        # skip lines that don't look like real user checkouts
+        if accept_user is not None and not accept_user(user):
+            continue
 
+        rows.append((ts, user, m.group("host"), current_feature, 1, source_file))
+
+# One batched insert inside a single transaction
+cur.execute("BEGIN")
+cur.executemany(
+    """
+    INSERT INTO lmstat_snapshot
+      (ts, user, host, feature, count, source_file)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    rows
+)
 conn.commit()
 conn.close()
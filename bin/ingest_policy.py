@@ -17,8 +17,14 @@ if not OPTIONS:
 
 grp = {}       # {group_name: [user1, user2, ...]}
 grp_co = {}    # {group_name: company}
+rows = []      # [(user, company, feature, policy_max, source_file), ...]
 
 con = sqlite3.connect(DB)
+# WAL lets the GUI keep reading while we write; mmap/cache cut read syscalls
+for pragma in ("journal_mode=WAL", "synchronous=NORMAL",
+               "mmap_size=268435456", "cache_size=-65536",
+               "temp_store=MEMORY"):
+    con.execute(f"PRAGMA {pragma}")
 cur = con.cursor()
 
 # Ensure table exists
@@ -64,24 +70,26 @@ with open(OPTIONS, encoding="utf-8", errors="replace") as f:
                 users = grp.get(target)
                 if not users:
                     continue
-                company = grp_co.get(target, target.split("_", 1)[0])
-                for user in users:
-                    cur.execute(
-                        "INSERT OR REPLACE INTO license_policy VALUES (?,?,?,?,?)",
-                        (user, company, feature, maxv, OPTIONS)
-                    )
+                company = grp_co[target]
+                rows.extend((user, company, feature, maxv, OPTIONS) for user in users)
             elif kind == "USER":
                 user = target
                 company = user.split("-")[0]
-                cur.execute(
-                    "INSERT OR REPLACE INTO license_policy VALUES (?,?,?,?,?)",
-                    (user, company, feature, maxv, OPTIONS)
-                )
+                rows.append((user, company, feature, maxv, OPTIONS))
             else:
                 continue
 
         # Skip EXCLUDE/INCLUDE lines — they are FlexLM directives, not DB entries
 
+# Same transaction as the DELETE above; rows keep file order so later
+# MAX lines still replace earlier ones for the same (user, feature).
+cur.executemany("INSERT OR REPLACE INTO license_policy VALUES (?,?,?,?,?)", rows)
+
+# Policy feeds company/policy_max of every mv_usage_* row; clearing the
+# state makes the next make_reports.py run rebuild them in full
+cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='mv_usage_state'")
+if cur.fetchone():
+    cur.execute("DELETE FROM mv_usage_state")
 con.commit()
 con.close()
 print(f"Policy ingested from: {OPTIONS}")
@@ -7,11 +7,21 @@ CREATE TABLE IF NOT EXISTS lmstat_snapshot (
   host TEXT,
   feature TEXT NOT NULL,
   count INTEGER NOT NULL,
-  source_file TEXT NOT NULL
+  source_file TEXT NOT NULL,
+  -- Added after the first release: migrate_db.py adds these columns to
+  -- older databases and creates their indexes
+  ts_date TEXT GENERATED ALWAYS AS (substr(ts, 1, 10)) VIRTUAL,
+  company TEXT GENERATED ALWAYS AS (substr(user, 1, instr(user, '-') - 1)) VIRTUAL
 );
 
 CREATE INDEX IF NOT EXISTS idx_snap_ts
   ON lmstat_snapshot(ts);
 
+CREATE INDEX IF NOT EXISTS idx_snap_feat_ts
+  ON lmstat_snapshot(feature, ts);
+
 CREATE INDEX IF NOT EXISTS idx_snap_user_feat
   ON lmstat_snapshot(user, feature);
+
+CREATE INDEX IF NOT EXISTS idx_snap_source
+  ON lmstat_snapshot(source_file);
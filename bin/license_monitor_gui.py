@@ -14,6 +14,9 @@ Interactive dashboard for visualizing license usage with:
 import sys
 import os
 import sqlite3
+import threading
+import functools
+import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -23,7 +26,7 @@ from PyQt5.QtWidgets import (
     QTabWidget, QSpinBox, QCheckBox, QGroupBox, QGridLayout, QMessageBox,
     QFileDialog, QProgressBar, QStatusBar, QSplitter, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QDate, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QDate, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QFont
 
 import matplotlib.pyplot as plt
@@ -31,6 +34,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.dates import DateFormatter, MonthLocator, WeekdayLocator
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
 
 import pandas as pd
 import numpy as np
@@ -48,74 +52,186 @@ BASE_DIR = Path(os.environ.get(
 DB_PATH = BASE_DIR / "db" / "license_monitor.db"
 REPORTS_DIR = BASE_DIR / "reports"
 
+# Exports above this many rows are written by to_csv in chunks
+CSV_STREAM_THRESHOLD = 100_000
+CSV_CHUNK_ROWS = 50_000
+# Rows fetched per cursor batch when loading usage data
+SQL_CHUNK_ROWS = 50_000
+
+# Indexed generated columns on lmstat_snapshot (init_db.sql / migrate_db.py)
+# and the expression each stands for: (name, expression)
+DERIVED_COLUMNS = (
+    ("ts_date", "substr(ts, 1, 10)"),
+    ("company", "substr(user, 1, instr(user, '-') - 1)"),
+)
+
 
 # ============================================================
 # Database Helper
 # ============================================================
 
+def parse_snapshot_ts(ts):
+    """Parse lmstat_snapshot.ts values into datetimes (NaT when unparseable).
+
+    ingest_lmstat.py stores '2026-01-28 10-04-22' and bulk_ingest.py stores
+    '2026-01-28 10:04:22'; both are normalized to the latter before parsing.
+    """
+    ts = ts.astype(str)
+    normalized = ts.str.slice(0, 10) + ' ' + ts.str.slice(11, 19).str.replace('-', ':', regex=False)
+    return pd.to_datetime(normalized, format='%Y-%m-%d %H:%M:%S', errors='coerce', cache=True)
+
+
+def cached_until_db_changes(method):
+    """Memoize a DatabaseManager lookup until the DB (or its WAL) is modified."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stamp = self._db_stamp()
+        if stamp != self._lookup_stamp:
+            self._lookup_cache.clear()
+            self._lookup_stamp = stamp
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = method(self, *args, **kwargs)
+        return self._lookup_cache[key]
+    return wrapper
+
+
 class DatabaseManager:
     def __init__(self, db_path):
         self.db_path = db_path
+        # One connection per thread. The GUI thread keeps its connection (and
+        # SQLite's page cache) across filter changes; each DataLoaderThread is
+        # a new thread, so it opens a fresh one and closes it when done
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        # SQL expressions for the snapshot date and company: the indexed
+        # generated columns if the schema has them, else the raw expressions
+        self._date_expr = None
+        self._company_expr = None
+        # Filter-option lookups only change on ingest; see cached_until_db_changes
+        self._lookup_cache = {}
+        self._lookup_stamp = None
 
     def get_connection(self):
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path))
+            for pragma in ("journal_mode=WAL", "synchronous=NORMAL",
+                           "temp_store=MEMORY", "cache_size=-64000"):
+                conn.execute(f"PRAGMA {pragma}")
+            self._local.conn = conn
+            self._detect_derived_columns(conn)
         return conn
 
+    def _detect_derived_columns(self, conn):
+        """Use the generated ts_date/company columns when the schema has them.
+
+        Filtering on substr(...) expressions can't use an index; the generated
+        columns can. The GUI only reads: older databases keep working through
+        the raw expressions until bin/migrate_db.py adds the columns.
+        """
+        with self._schema_lock:
+            if self._date_expr is not None:
+                return
+            cols = {row[1] for row in conn.execute("PRAGMA table_xinfo(lmstat_snapshot)")}
+            self._date_expr, self._company_expr = (
+                name if name in cols else expr for name, expr in DERIVED_COLUMNS)
+
+    def close(self):
+        """Close the calling thread's cached connection, if any."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _db_stamp(self):
+        """mtimes of the DB file and its WAL; changes whenever data is written."""
+        stamp = []
+        for path in (str(self.db_path), f"{self.db_path}-wal"):
+            try:
+                stamp.append(os.path.getmtime(path))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    @cached_until_db_changes
     def get_features(self):
         """Get all unique features"""
         conn = self.get_connection()
         cur = conn.cursor()
         cur.execute("SELECT DISTINCT feature FROM lmstat_snapshot ORDER BY feature")
-        features = [row[0] for row in cur.fetchall()]
-        conn.close()
-        return features
+        # Unpack the single column while streaming the cursor; no fetchall() list
+        return [value for (value,) in cur]
 
+    @cached_until_db_changes
     def get_companies(self):
         """Get all unique companies"""
         conn = self.get_connection()
         cur = conn.cursor()
-        cur.execute("""
-            SELECT DISTINCT substr(user, 1, instr(user, '-') - 1) as company
+        cur.execute(f"""
+            SELECT DISTINCT {self._company_expr} as company
             FROM lmstat_snapshot
-            WHERE user LIKE '%-%'
+            WHERE {self._company_expr} <> ''
             ORDER BY company
         """)
-        companies = [row[0] for row in cur.fetchall()]
-        conn.close()
-        return companies
+        return [value for (value,) in cur]
 
+    @cached_until_db_changes
     def get_users(self, company=None):
         """Get users, optionally filtered by company"""
         conn = self.get_connection()
         cur = conn.cursor()
         if company:
             cur.execute(
-                "SELECT DISTINCT user FROM lmstat_snapshot WHERE user LIKE ? ORDER BY user",
-                (f"{company}-%",)
+                f"SELECT DISTINCT user FROM lmstat_snapshot WHERE {self._company_expr} = ? ORDER BY user",
+                (company,)
             )
         else:
             cur.execute("SELECT DISTINCT user FROM lmstat_snapshot ORDER BY user")
-        users = [row[0] for row in cur.fetchall()]
-        conn.close()
-        return users
+        return [value for (value,) in cur]
 
+    @cached_until_db_changes
     def get_date_range(self):
         """Get min and max dates in database"""
         conn = self.get_connection()
         cur = conn.cursor()
-        cur.execute("""
+        # Separate MIN/MAX subqueries so each is a single index seek on ts_date
+        date_expr = self._date_expr
+        cur.execute(f"""
             SELECT
-              MIN(datetime(substr(ts,1,4) || '-' || substr(ts,6,2) || '-' || substr(ts,9,2))) as min_ts,
-              MAX(datetime(substr(ts,1,4) || '-' || substr(ts,6,2) || '-' || substr(ts,9,2))) as max_ts
-            FROM lmstat_snapshot
+              datetime((SELECT MIN({date_expr}) FROM lmstat_snapshot)) as min_ts,
+              datetime((SELECT MAX({date_expr}) FROM lmstat_snapshot)) as max_ts
         """)
         result = cur.fetchone()
-        conn.close()
         if result[0] and result[1]:
             return datetime.fromisoformat(result[0]), datetime.fromisoformat(result[1])
         return datetime.now() - timedelta(days=30), datetime.now()
 
+    def _where_clause(self, start_date, end_date, features=None, companies=None, users=None):
+        """Build the shared snapshot filter as (where_sql, params).
+
+        List filters are bound as one JSON array each and expanded with
+        json_each, so the SQL text depends only on which filters are set,
+        not on how many values they hold; sqlite3's statement cache then
+        reuses the prepared query across filter changes.
+        """
+        where_clauses = [f"{self._date_expr} BETWEEN :start_date AND :end_date"]
+        params = {
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "end_date": end_date.strftime("%Y-%m-%d"),
+        }
+
+        for name, column, values in (
+            ("features", "feature", features),
+            ("companies", self._company_expr, companies),
+            ("users", "user", users),
+        ):
+            if values:
+                where_clauses.append(f"{column} IN (SELECT value FROM json_each(:{name}))")
+                params[name] = json.dumps(list(values))
+
+        return " AND ".join(where_clauses), params
+
     def query_usage_data(self, start_date, end_date, features=None, companies=None, users=None, raw_snapshots=False):
         """Query time-series usage data with optional filters
         
@@ -124,67 +240,96 @@ class DatabaseManager:
                           If False, return aggregated data for hourly/daily views.
         """
         conn = self.get_connection()
-        cur = conn.cursor()
+        where_sql, params = self._where_clause(start_date, end_date, features, companies, users)
 
         if raw_snapshots:
             # For minute-by-minute: Return all individual snapshots as collected
-            query = """
+            query = f"""
                 SELECT
                   ts,
-                  substr(user, 1, instr(user, '-') - 1) as company,
+                  {self._company_expr} as company,
                   feature,
                   user,
                   1 as snapshot_count,
                   1 as active_users,
                   ROUND(5 / 60.0, 2) as usage_hours
                 FROM lmstat_snapshot
-                WHERE
-                  substr(ts, 1, 10) BETWEEN ? AND ?
+                WHERE {where_sql}
+                ORDER BY ts, feature
             """
         else:
             # For hourly/daily: Aggregate snapshots
-            query = """
+            query = f"""
                 SELECT
                   ts,
-                  substr(user, 1, instr(user, '-') - 1) as company,
+                  {self._company_expr} as company,
                   feature,
                   user,
                   COUNT(*) as snapshot_count,
                   COUNT(DISTINCT user) as active_users,
                   ROUND(COUNT(*) * 5 / 60.0, 2) as usage_hours
                 FROM lmstat_snapshot
-                WHERE
-                  substr(ts, 1, 10) BETWEEN ? AND ?
+                WHERE {where_sql}
+                GROUP BY ts, company, feature, user
+                ORDER BY ts, feature
             """
 
-        params = [start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")]
-
-        if features and len(features) > 0:
-            placeholders = ",".join("?" * len(features))
-            query += f" AND feature IN ({placeholders})"
-            params.extend(features)
-
-        if companies and len(companies) > 0:
-            company_pattern = " OR ".join([f"user LIKE ?" for _ in companies])
-            query += f" AND ({company_pattern})"
-            for company in companies:
-                params.append(f"{company}-%")
-
-        if users and len(users) > 0:
-            placeholders = ",".join("?" * len(users))
-            query += f" AND user IN ({placeholders})"
-            params.extend(users)
+        # Columnar fill straight from the cursor; no dict per row. Read in
+        # chunks so a long Minute-by-Minute range never holds every row as
+        # Python tuples at once, then join them with a single concat
+        chunks = list(pd.read_sql_query(query, conn, params=params, chunksize=SQL_CHUNK_ROWS))
+        if chunks:
+            df = pd.concat(chunks, ignore_index=True)
+        else:
+            df = pd.read_sql_query(query, conn, params=params)  # empty frame with columns
+
+        # Counts are small non-negative ints and hours need no float64 precision;
+        # this frame is held as current_data and reused by every tab
+        for col in ('snapshot_count', 'active_users'):
+            df[col] = pd.to_numeric(df[col], downcast='unsigned')
+        df['usage_hours'] = pd.to_numeric(df['usage_hours'], downcast='float')
+        # Few distinct values repeated per row: store as integer codes so
+        # grouping/factorizing skips per-row string hashing
+        for col in ('company', 'feature', 'user'):
+            df[col] = df[col].astype('category')
+
+        # Parse ts once here, on the loader thread, so chart redraws reuse it
+        df['datetime'] = parse_snapshot_ts(df['ts'])
+        return df
+
+    def query_usage_series(self, start_date, end_date, features=None, companies=None, users=None,
+                           granularity="Daily"):
+        """Query chart-ready usage hours per (time_bin, feature), bucketed in SQL
 
-        if not raw_snapshots:
-            query += " GROUP BY ts, company, feature, user"
-        
-        query += " ORDER BY ts, feature"
+        Args:
+            granularity: "Daily" bins by date ('%Y-%m-%d'), "Hourly" by hour ('%Y-%m-%d %H:00').
+        """
+        conn = self.get_connection()
+        where_sql, params = self._where_clause(start_date, end_date, features, companies, users)
 
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        conn.close()
+        if granularity == "Hourly":
+            # ts looks like 2026-01-28 10-04-22 or 2026-01-28 10:04:22
+            time_bin = "substr(ts, 1, 10) || ' ' || substr(ts, 12, 2) || ':00'"
+        else:
+            time_bin = self._date_expr
 
-        return pd.DataFrame([dict(row) for row in rows])
+        # Inner query matches query_usage_data's per-(ts, user, feature) rows,
+        # so the summed usage_hours are the same as a pandas groupby over them
+        query = f"""
+            SELECT time_bin, feature, SUM(usage_hours) as usage_hours
+            FROM (
+              SELECT
+                {time_bin} as time_bin,
+                feature,
+                ROUND(COUNT(*) * 5 / 60.0, 2) as usage_hours
+              FROM lmstat_snapshot
+              WHERE {where_sql}
+              GROUP BY ts, feature, user
+            )
+            GROUP BY time_bin, feature
+            ORDER BY feature, time_bin
+        """
+        return pd.read_sql_query(query, conn, params=params)
 
     def get_summary_stats(self, start_date, end_date, features=None, companies=None):
         """Get summary statistics for the selected period.
@@ -194,62 +339,36 @@ class DatabaseManager:
         Also fetches policy_max for utilization_pct calculation.
         """
         conn = self.get_connection()
-        cur = conn.cursor()
 
         # Build WHERE clause for filters
-        where_clauses = ["substr(ts, 1, 10) BETWEEN ? AND ?"]
-        params = [start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")]
-
-        if features and len(features) > 0:
-            placeholders = ",".join("?" * len(features))
-            where_clauses.append(f"feature IN ({placeholders})")
-            params.extend(features)
-
-        if companies and len(companies) > 0:
-            company_pattern = " OR ".join([f"user LIKE ?" for _ in companies])
-            where_clauses.append(f"({company_pattern})")
-            for company in companies:
-                params.append(f"{company}-%")
-
-        where_sql = " AND ".join(where_clauses)
+        where_sql, params = self._where_clause(start_date, end_date, features, companies)
 
-        # Step 1: Get basic per-feature stats
-        query_basic = f"""
+        # Step 1+2: Per-feature stats and concurrency in one scan. Window
+        # functions tag each row with its (ts, feature) concurrent count; only
+        # the first row of each snapshot feeds the avg so it stays per-snapshot.
+        query_stats = f"""
+            WITH snap AS (
+              SELECT
+                feature, user, {self._date_expr} as ts_date,
+                COUNT(*) OVER (PARTITION BY ts, feature) as concurrent_count,
+                ROW_NUMBER() OVER (PARTITION BY ts, feature) as snap_row
+              FROM lmstat_snapshot
+              WHERE {where_sql}
+            )
             SELECT
               feature,
               COUNT(*) as total_snapshots,
               COUNT(DISTINCT user) as unique_users,
-              COUNT(DISTINCT date(substr(ts,1,10))) as active_days
-            FROM lmstat_snapshot
-            WHERE {where_sql}
-            GROUP BY feature ORDER BY feature
-        """
-
-        # Step 2: Get concurrent counts per snapshot per feature,
-        # then compute avg and peak concurrent
-        query_concurrent = f"""
-            SELECT
-              feature,
-              ROUND(AVG(concurrent_count), 2) as avg_concurrent,
+              COUNT(DISTINCT ts_date) as active_days,
+              ROUND(AVG(CASE WHEN snap_row = 1 THEN concurrent_count END), 2) as avg_concurrent,
               MAX(concurrent_count) as peak_concurrent
-            FROM (
-              SELECT
-                ts, feature,
-                COUNT(*) as concurrent_count
-              FROM lmstat_snapshot
-              WHERE {where_sql}
-              GROUP BY ts, feature
-            )
-            GROUP BY feature
+            FROM snap
+            GROUP BY feature ORDER BY feature
         """
 
-        cur.execute(query_basic, params)
-        basic_rows = cur.fetchall()
-        basic_df = pd.DataFrame([dict(row) for row in basic_rows])
-
-        cur.execute(query_concurrent, params)
-        conc_rows = cur.fetchall()
-        conc_df = pd.DataFrame([dict(row) for row in conc_rows])
+        result = pd.read_sql_query(query_stats, conn, params=params)
+        if result.empty:
+            return result
 
         # Step 3: Get policy_max per feature (across all companies)
         policy_query = """
@@ -257,35 +376,38 @@ class DatabaseManager:
             FROM license_policy
             GROUP BY feature
         """
-        cur.execute(policy_query)
-        policy_rows = cur.fetchall()
-        policy_df = pd.DataFrame([dict(row) for row in policy_rows])
-
-        conn.close()
-
-        if basic_df.empty:
-            return basic_df
+        policy_df = pd.read_sql_query(policy_query, conn, index_col='feature')
 
-        # Merge basic + concurrent
-        result = basic_df.merge(conc_df, on='feature', how='left')
+        # Look up policy_max by feature (NaN where a feature has no policy)
+        result['policy_max'] = result['feature'].map(policy_df['policy_max'])
 
-        # Merge policy
-        if not policy_df.empty:
-            result = result.merge(policy_df, on='feature', how='left')
-        else:
-            result['policy_max'] = None
-
-        # Compute utilization_pct
-        result['utilization_pct'] = result.apply(
-            lambda r: round(r['avg_concurrent'] / r['policy_max'] * 100, 1)
-            if pd.notna(r.get('policy_max')) and r.get('policy_max', 0) > 0
-            else None,
-            axis=1
+        # Compute utilization_pct (NaN where there is no usable policy_max)
+        policy_max = pd.to_numeric(result['policy_max'], errors='coerce')
+        has_policy = policy_max.notna() & (policy_max > 0)
+        result['utilization_pct'] = np.where(
+            has_policy, (result['avg_concurrent'] / policy_max * 100).round(1), np.nan
         )
 
         return result
 
 
+def write_csv_atomic(df, file_path, **to_csv_kwargs):
+    """Write df with to_csv to a temp file beside file_path, then rename it into place.
+
+    A failed export leaves any existing file untouched and no partial file behind.
+    """
+    tmp_path = f"{file_path}.part"
+    try:
+        df.to_csv(tmp_path, index=False, **to_csv_kwargs)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 # ============================================================
 # Data Loading Thread (non-blocking)
 # ============================================================
@@ -303,18 +425,45 @@ class DataLoaderThread(QThread):
         self.companies = companies
         self.users = users
         self.timeline = timeline
+        self._conn = None
+
+    def cancel(self):
+        """Stop this load: flag the thread and abort its running SQLite query."""
+        self.requestInterruption()
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.interrupt()  # safe from another thread; the query raises OperationalError
+            except sqlite3.ProgrammingError:
+                pass  # load already finished and closed its connection
 
     def run(self):
         try:
+            self._conn = self.db_manager.get_connection()
             # For minute-by-minute, fetch raw snapshots; otherwise aggregate
             raw_snapshots = (self.timeline == "Minute-by-Minute")
             data = self.db_manager.query_usage_data(
                 self.start_date, self.end_date, self.features, self.companies, self.users,
                 raw_snapshots=raw_snapshots
             )
-            self.data_loaded.emit(data)
+            if self.isInterruptionRequested():
+                return
+            # Daily/Hourly charts come pre-bucketed from SQL
+            series = None
+            if not raw_snapshots:
+                series = self.db_manager.query_usage_series(
+                    self.start_date, self.end_date, self.features, self.companies, self.users,
+                    granularity=self.timeline
+                )
+            if not self.isInterruptionRequested():
+                self.data_loaded.emit((data, series))
         except Exception as e:
-            self.error_occurred.emit(str(e))
+            if not self.isInterruptionRequested():
+                self.error_occurred.emit(str(e))
+        finally:
+            # This thread's connection is never reused by a later load
+            self._conn = None
+            self.db_manager.close()
 
 
 # ============================================================
@@ -330,6 +479,15 @@ class LicenseMonitorGUI(QMainWindow):
         self.db_manager = DatabaseManager(DB_PATH)
         self.current_data = None
         self.data_loader_thread = None
+        # Cancelled loaders still winding down; referenced until finished so
+        # their QThread isn't destroyed while running
+        self._stale_loaders = set()
+
+        # Coalesce bursts of filter changes into a single query
+        self._apply_timer = QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(200)
+        self._apply_timer.timeout.connect(self._do_apply_filters)
 
         self.init_ui()
         self.load_filter_options()
@@ -397,7 +555,7 @@ class LicenseMonitorGUI(QMainWindow):
         # Action buttons
         filter_layout.addWidget(QLabel("Actions:"), 2, 3)
         self.apply_btn = QPushButton("Apply Filters")
-        self.apply_btn.clicked.connect(self.apply_filters)
+        self.apply_btn.clicked.connect(self._do_apply_filters)
         filter_layout.addWidget(self.apply_btn, 2, 4)
 
         self.export_btn = QPushButton("Export CSV")
@@ -457,26 +615,18 @@ class LicenseMonitorGUI(QMainWindow):
 
     def load_filter_options(self):
         """Load available filters from database"""
-        # Load features
-        features = self.db_manager.get_features()
-        self.feature_list.clear()
-        for feature in features:
-            item = self.feature_list.addItem(feature)
-        self.feature_list.selectAll()
-
-        # Load companies
-        companies = self.db_manager.get_companies()
-        self.company_list.clear()
-        for company in companies:
-            self.company_list.addItem(company)
-        self.company_list.selectAll()
-
-        # Load users
-        users = self.db_manager.get_users()
-        self.user_list.clear()
-        for user in users:
-            self.user_list.addItem(user)
-        self.user_list.selectAll()
+        # Fill each list in one call with signals blocked, so the clear/selectAll
+        # don't fire itemSelectionChanged -> apply_filters while loading
+        for list_widget, values in (
+            (self.feature_list, self.db_manager.get_features()),
+            (self.company_list, self.db_manager.get_companies()),
+            (self.user_list, self.db_manager.get_users()),
+        ):
+            list_widget.blockSignals(True)
+            list_widget.clear()
+            list_widget.addItems(values)
+            list_widget.selectAll()
+            list_widget.blockSignals(False)
 
     def on_period_changed(self, period_text):
         """Handle period preset selection"""
@@ -518,7 +668,12 @@ class LicenseMonitorGUI(QMainWindow):
         return start_date, end_date, features, companies, users
 
     def apply_filters(self):
+        """Schedule a data reload; restarts the debounce window on each call"""
+        self._apply_timer.start()
+
+    def _do_apply_filters(self):
         """Apply filters and load data"""
+        self._apply_timer.stop()
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.status_label.showMessage("Loading data...")
@@ -526,6 +681,15 @@ class LicenseMonitorGUI(QMainWindow):
         start_date, end_date, features, companies, users = self.get_selected_filters()
         timeline = self.timeline_combo.currentText()
 
+        # Only the newest load may update the UI; cancel the one in flight
+        old = self.data_loader_thread
+        if old is not None and old.isRunning():
+            old.data_loaded.disconnect()
+            old.error_occurred.disconnect()
+            old.cancel()
+            self._stale_loaders.add(old)
+            old.finished.connect(lambda t=old: self._stale_loaders.discard(t))
+
         # Load data in background thread
         self.data_loader_thread = DataLoaderThread(
             self.db_manager, start_date, end_date, features, companies, users, timeline
@@ -534,12 +698,13 @@ class LicenseMonitorGUI(QMainWindow):
         self.data_loader_thread.error_occurred.connect(self.on_data_error)
         self.data_loader_thread.start()
 
-    def on_data_loaded(self, data):
+    def on_data_loaded(self, result):
         """Handle loaded data"""
+        data, series = result
         self.current_data = data
         self.progress_bar.setValue(50)
 
-        self.update_chart(data)
+        self.update_chart(data, series)
         self.progress_bar.setValue(75)
 
         self.update_stats_table(data)
@@ -557,8 +722,12 @@ class LicenseMonitorGUI(QMainWindow):
         self.progress_bar.setVisible(False)
         QMessageBox.critical(self, "Error", f"Failed to load data:\n{error_msg}")
 
-    def update_chart(self, data):
-        """Update the time-series chart with selectable timeline granularity"""
+    def update_chart(self, data, series=None):
+        """Update the time-series chart with selectable timeline granularity
+
+        Args:
+            series: Per-(time_bin, feature) usage from query_usage_series for Daily/Hourly.
+        """
         self.figure.clear()
         ax = self.figure.add_subplot(111)
 
@@ -570,44 +739,45 @@ class LicenseMonitorGUI(QMainWindow):
 
         # Get selected timeline granularity
         timeline = self.timeline_combo.currentText()
-        
-        # Parse timestamps
-        data_copy = data.copy()
-        # Handle timestamp format: 2026-01-28_10-04-22
-        data_copy['datetime'] = pd.to_datetime(
-            data_copy['ts'].str.replace('_', ' ').str.replace('-', ' ').str.replace('  ', ' '),
-            format='%Y %m %d %H %M %S', errors='coerce'
-        )
-        
+
         # For minute-by-minute: plot raw snapshots directly without aggregation
         if timeline == "Minute-by-Minute":
             x_label = 'Time (Minute)'
-            # Sort by datetime for continuous line
-            data_copy = data_copy.sort_values('datetime')
-            
-            # Plot lines for each feature
-            for feature in data_copy['feature'].unique():
-                feature_data = data_copy[data_copy['feature'] == feature]
-                feature_data = feature_data.sort_values('datetime')
-                ax.plot(feature_data['datetime'], feature_data['usage_hours'],
-                       marker='o', label=feature, linewidth=2, markersize=4)
+            # Timestamps were parsed once at load (query_usage_data). Rows arrive
+            # ORDER BY ts from SQL, so no re-sort is needed for a continuous line
+            data_copy = data.dropna(subset=['datetime'])
+
+            # One LineCollection + one scatter for all features instead of an
+            # ax.plot (with its own markers and transforms) per feature
+            cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+            x_all = mdates.date2num(data_copy['datetime'].to_numpy())
+            y_all = data_copy['usage_hours'].to_numpy(dtype=float)
+            codes, features = pd.factorize(data_copy['feature'])  # first-seen order
+            colors = [cycle[i % len(cycle)] for i in range(len(features))]
+            # Stable sort by feature keeps each feature's points in time order
+            order = np.argsort(codes, kind='stable')
+            segments = np.split(np.column_stack([x_all, y_all])[order],
+                                np.cumsum(np.bincount(codes))[:-1])
+            if len(features):
+                ax.add_collection(LineCollection(segments, colors=colors, linewidths=2))
+                ax.scatter(x_all, y_all, c=[colors[i] for i in codes], s=16, zorder=3)
+            for feature, color in zip(features, colors):
+                # Empty line as the legend entry for each feature
+                ax.plot([], [], color=color, marker='o', label=feature, linewidth=2, markersize=4)
+            ax.xaxis_date()
+            ax.autoscale_view()
         else:
-            # For Daily/Hourly: aggregate by time bin
+            # For Daily/Hourly: already aggregated by time bin and feature in SQL
             if timeline == "Hourly":
-                data_copy['time_bin'] = data_copy['datetime'].dt.strftime('%Y-%m-%d %H:00')
                 x_label = 'Time (Hour)'
             else:  # Daily (default)
-                data_copy['time_bin'] = data_copy['datetime'].dt.strftime('%Y-%m-%d')
                 x_label = 'Date (Day)'
-            
-            # Aggregate by time bin and feature
-            by_time_feature = data_copy.groupby(['time_bin', 'feature'])['usage_hours'].sum().reset_index()
+
+            by_time_feature = series.copy()
             by_time_feature['datetime'] = pd.to_datetime(by_time_feature['time_bin'])
-            
-            # Plot lines for each feature
-            for feature in by_time_feature['feature'].unique():
-                feature_data = by_time_feature[by_time_feature['feature'] == feature]
-                feature_data = feature_data.sort_values('datetime')
+
+            # Plot lines for each feature (rows arrive ordered by feature, time_bin)
+            for feature, feature_data in by_time_feature.groupby('feature', sort=False):
                 ax.plot(feature_data['datetime'], feature_data['usage_hours'],
                        marker='o', label=feature, linewidth=2, markersize=4)
 
@@ -638,21 +808,24 @@ class LicenseMonitorGUI(QMainWindow):
             [item.text() for item in self.company_list.selectedItems()]
         )
 
-        for idx, row in stats.iterrows():
-            self.stats_table.insertRow(idx)
-            self.stats_table.setItem(idx, 0, QTableWidgetItem(str(row['feature'])))
-            self.stats_table.setItem(idx, 1, QTableWidgetItem(str(row['total_snapshots'])))
-            self.stats_table.setItem(idx, 2, QTableWidgetItem(str(row['unique_users'])))
-            self.stats_table.setItem(idx, 3, QTableWidgetItem(str(row['active_days'])))
-            self.stats_table.setItem(idx, 4, QTableWidgetItem(str(row['avg_concurrent'])))
-
-            peak = row.get('peak_concurrent', '')
-            self.stats_table.setItem(idx, 5, QTableWidgetItem(str(peak if pd.notna(peak) else '')))
+        table = self.stats_table
+        sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(stats))
+
+        columns = ['feature', 'total_snapshots', 'unique_users', 'active_days',
+                   'avg_concurrent', 'peak_concurrent', 'policy_max', 'utilization_pct']
+        for idx, (feature, total_snapshots, unique_users, active_days, avg_concurrent,
+                  peak, policy_max, utilization_pct) in enumerate(stats[columns].itertuples(index=False, name=None)):
+            table.setItem(idx, 0, QTableWidgetItem(str(feature)))
+            table.setItem(idx, 1, QTableWidgetItem(str(total_snapshots)))
+            table.setItem(idx, 2, QTableWidgetItem(str(unique_users)))
+            table.setItem(idx, 3, QTableWidgetItem(str(active_days)))
+            table.setItem(idx, 4, QTableWidgetItem(str(avg_concurrent)))
+            table.setItem(idx, 5, QTableWidgetItem(str(peak if pd.notna(peak) else '')))
+            table.setItem(idx, 6, QTableWidgetItem(str(int(policy_max) if pd.notna(policy_max) else 'N/A')))
 
-            policy_max = row.get('policy_max', '')
-            self.stats_table.setItem(idx, 6, QTableWidgetItem(str(int(policy_max) if pd.notna(policy_max) else 'N/A')))
-
-            utilization_pct = row.get('utilization_pct')
             if pd.notna(utilization_pct):
                 util_item = QTableWidgetItem(f"{utilization_pct:.1f}%")
                 if utilization_pct >= 80:
@@ -663,9 +836,11 @@ class LicenseMonitorGUI(QMainWindow):
                     util_item.setBackground(QColor(255, 182, 182))  # Light red
             else:
                 util_item = QTableWidgetItem("N/A")
-            self.stats_table.setItem(idx, 7, util_item)
+            table.setItem(idx, 7, util_item)
 
-        self.stats_table.resizeColumnsToContents()
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(sorting)
+        table.resizeColumnsToContents()
 
     def update_detail_table(self, data):
         """Update detailed usage table"""
@@ -674,17 +849,32 @@ class LicenseMonitorGUI(QMainWindow):
         if data.empty:
             return
 
-        for idx, row in data.iterrows():
-            self.detail_table.insertRow(idx)
-            self.detail_table.setItem(idx, 0, QTableWidgetItem(str(row['ts'])))
-            self.detail_table.setItem(idx, 1, QTableWidgetItem(str(row['company'])))
-            self.detail_table.setItem(idx, 2, QTableWidgetItem(str(row['feature'])))
-            self.detail_table.setItem(idx, 3, QTableWidgetItem(str(row['user'])))
-            self.detail_table.setItem(idx, 4, QTableWidgetItem(str(row['snapshot_count'])))
-            self.detail_table.setItem(idx, 5, QTableWidgetItem(str(row['active_users'])))
-            self.detail_table.setItem(idx, 6, QTableWidgetItem(str(row['usage_hours'])))
-
-        self.detail_table.resizeColumnsToContents()
+        # Size the table once and fill it with signals/repaints held off,
+        # instead of an insertRow + layout pass per record
+        table = self.detail_table
+        sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(data))
+
+        columns = ['ts', 'company', 'feature', 'user', 'snapshot_count', 'active_users', 'usage_hours']
+        for idx, values in enumerate(data[columns].itertuples(index=False, name=None)):
+            for col, value in enumerate(values):
+                table.setItem(idx, col, QTableWidgetItem(str(value)))
+
+        table.setUpdatesEnabled(True)
+        table.setSortingEnabled(sorting)
+        table.resizeColumnsToContents()
+
+    def closeEvent(self, event):
+        """Release the cached database connection on exit"""
+        self._apply_timer.stop()
+        for loader in [self.data_loader_thread, *self._stale_loaders]:
+            if loader is not None:
+                loader.cancel()
+                loader.wait()
+        self.db_manager.close()
+        super().closeEvent(event)
 
     def export_data(self):
         """Export current data to CSV"""
@@ -698,7 +888,12 @@ class LicenseMonitorGUI(QMainWindow):
 
         if file_path:
             try:
-                self.current_data.to_csv(file_path, index=False)
+                data = self.current_data
+                # The parsed datetime column is internal; export the queried columns
+                columns = [c for c in data.columns if c != 'datetime']
+                # Format and write a slice at a time instead of one huge buffer
+                chunksize = CSV_CHUNK_ROWS if len(data) > CSV_STREAM_THRESHOLD else None
+                write_csv_atomic(data, file_path, columns=columns, chunksize=chunksize)
                 QMessageBox.information(self, "Success", f"Data exported to:\n{file_path}")
                 self.status_label.showMessage(f"Exported to {file_path}")
             except Exception as e:
@@ -9,6 +9,8 @@
 #   v_usage_monthly_ext
 #   v_usage_quarterly_ext
 #   v_usage_yearly_ext
+# read through their mv_usage_* tables (views.sql, section 7)
+# when present, refreshed here before the reports are written
 #
 # Output:
 #   reports/{weekly,monthly,quarterly,yearly}/usage_*.csv
@@ -16,10 +18,14 @@
 #   reports/index.html
 # ============================================================
 
+import io
+import json
 import os
 import sqlite3
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from string import Template
 
 BASE = "/home/appl/license_monitor"
 DB   = f"{BASE}/db/license_monitor.db"
@@ -32,6 +38,16 @@ PERIODS = [
     ("yearly",    "v_usage_yearly_ext"),
 ]
 
+# Period key of each view, as computed in views.sql; used to find the
+# mv_usage_* rows that newly ingested snapshots fall into
+PERIOD_KEYS = {
+    "weekly":    "strftime('%Y-W%W', ts_norm)",
+    "monthly":   "strftime('%Y-%m', ts_norm)",
+    "quarterly": "strftime('%Y', ts_norm) || '-Q' || "
+                 "((cast(strftime('%m', ts_norm) as integer)-1)/3 + 1)",
+    "yearly":    "strftime('%Y', ts_norm)",
+}
+
 CSV_HEADER = [
     "period",
     "company",
@@ -50,141 +66,228 @@ CSV_HEADER = [
     "utilization_status",
 ]
 
+COLUMNS_SQL = ", ".join(CSV_HEADER)
+
+# summary.md and index.html are each rendered from one template and
+# written with a single call
+SUMMARY_MD_TEMPLATE = Template("""\
+# $title License Usage Summary
+
+- Generated: $now
+- Source view: `$view_name`
+
+## Active Companies ($company_count)
+$companies
+## Features Used
+$features
+## Policy Effectiveness
+$policy
+### Metric Definitions (Audit 기준)
+- **usage_count**: Number of snapshots with active checkout
+- **active_users**: Distinct users in the period
+- **active_snapshots**: Time slices with activity
+- **avg_concurrent**: time-weighted average = usage_hours / period_hours
+- **peak_concurrent**: MAX simultaneous checkouts at any single snapshot
+- **policy_max**: MAX copy from options.opt
+- **active_utilization_pct**: (avg concurrent when in use) / policy_max * 100
+- **period_utilization_pct**: usage_hours / (policy_max * period_hours) * 100
+- **utilization_status** (based on period_utilization_pct):
+  - EFFECTIVE_USE: ≥ 60% of capacity
+  - PARTIAL_USE: 20–60% of capacity
+  - UNDERUTILIZED: < 20% of capacity
+  - NO_POLICY: no MAX rule defined
+""")
+
+INDEX_HTML_TEMPLATE = Template("""\
+<html><head><title>License Monitor Reports</title></head><body>
+<h1>License Monitor Reports</h1>
+<p>Generated: $now</p>
+<ul>
+$items</ul>
+</body></html>
+""")
+
+# csv.writer's default line terminator, kept so output is unchanged
+CSV_EOL = "\r\n"
+
+
+def csv_line(row):
+    """Format one row as a CSV line; csv.writer only for rows that need quoting."""
+    line = ",".join("" if v is None else str(v) for v in row)
+    # An extra comma, a quote or a line break means some field needs quoting
+    if line.count(",") != len(row) - 1 or '"' in line or "\n" in line or "\r" in line:
+        buf = io.StringIO()
+        csv.writer(buf).writerow(row)
+        return buf.getvalue()
+    return line + CSV_EOL
+
+
 now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+
 # ------------------------------------------------------------
-# DB connection
+# Materialized report tables
 # ------------------------------------------------------------
-con = sqlite3.connect(DB)
-cur = con.cursor()
+def refresh_usage_mv(con):
+    """Bring the mv_usage_* tables up to date with lmstat_snapshot.
+
+    Only periods containing rows past the recorded high-water id are
+    re-aggregated from the views. Writers that rewrite or delete existing
+    rows clear mv_usage_state (views.sql, section 7); a missing state row
+    rebuilds every table. Returns False, so the reports read the views,
+    when views.sql has not created the state table and all four mv tables.
+    """
+    cur = con.cursor()
+    required = {"mv_usage_state", *(f"mv_usage_{period_name}" for period_name, _ in PERIODS)}
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'mv_usage_%'")
+    if not required <= {name for (name,) in cur}:
+        return False
+
+    state = cur.execute("SELECT last_id FROM mv_usage_state").fetchone()
+    max_id, = cur.execute("SELECT COALESCE(MAX(id), 0) FROM lmstat_snapshot").fetchone()
+    full = state is None
+    if not full and max_id == state[0]:
+        return True
+
+    # Periods touched by the new rows, for all four kinds in one scan
+    # (each row yields its weekly/monthly/quarterly/yearly key together)
+    touched = {period_name: set() for period_name, _ in PERIODS}
+    if not full:
+        cur.execute(
+            f"SELECT DISTINCT {', '.join(PERIOD_KEYS[p] for p, _ in PERIODS)} "
+            f"FROM v_usage_ts_norm WHERE id > ?",
+            (state[0],),
+        )
+        for keys in cur:
+            for (period_name, _), key in zip(PERIODS, keys):
+                touched[period_name].add(key)
+
+    with con:
+        for period_name, view_name in PERIODS:
+            mv = f"mv_usage_{period_name}"
+            if full:
+                cur.execute(f"DELETE FROM {mv}")
+                cur.execute(f"INSERT INTO {mv} SELECT * FROM {view_name}")
+                continue
+            keys = json.dumps(sorted(touched[period_name]))
+            cur.execute(f"DELETE FROM {mv} WHERE period IN (SELECT value FROM json_each(?))", (keys,))
+            cur.execute(
+                f"INSERT INTO {mv} SELECT * FROM {view_name} "
+                f"WHERE period IN (SELECT value FROM json_each(?))",
+                (keys,),
+            )
+        cur.execute("DELETE FROM mv_usage_state")
+        cur.execute("INSERT INTO mv_usage_state VALUES (?)", (max_id,))
+    return True
+
 
 # ------------------------------------------------------------
 # Generate reports per period
 # ------------------------------------------------------------
-index_rows = []
+def build_period(period_name, view_name, use_mv):
+    """Write the CSV and summary.md for one period on its own read-only connection."""
+    con = sqlite3.connect(f"file:{DB}?mode=ro", uri=True)
+    try:
+        return _write_period(con.cursor(), period_name, view_name, use_mv)
+    finally:
+        con.close()
+
 
-for period_name, view_name in PERIODS:
+def _write_period(cur, period_name, view_name, use_mv):
     out_dir = f"{RPT}/{period_name}"
     os.makedirs(out_dir, exist_ok=True)
 
     csv_path = f"{out_dir}/usage_{period_name}.csv"
     md_path  = f"{out_dir}/summary.md"
 
+    # ----------------------------
+    # Without the materialized table, snapshot the view once into a
+    # temp table so the queries below don't each re-evaluate it
+    # ----------------------------
+    if use_mv:
+        src = f"mv_usage_{period_name}"
+    else:
+        src = "rpt_usage"
+        cur.execute("DROP TABLE IF EXISTS temp.rpt_usage")
+        cur.execute(f"CREATE TEMP TABLE rpt_usage AS SELECT {COLUMNS_SQL} FROM {view_name}")
+
     # ----------------------------
     # CSV
     # ----------------------------
-    with open(csv_path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(CSV_HEADER)
-
-        cur.execute(f"""
-        SELECT
-          period,
-          company,
-          feature,
-          usage_count,
-          active_users,
-          active_snapshots,
-          usage_minutes,
-          usage_hours,
-          usage_ratio_percent,
-          avg_concurrent,
-          peak_concurrent,
-          policy_max,
-          active_utilization_pct,
-          period_utilization_pct,
-          utilization_status
-        FROM {view_name}
-        ORDER BY company, feature;
-        """)
-
-        rows = cur.fetchall()
-        for r in rows:
-            w.writerow(r)
+    with open(csv_path, "w", newline="", buffering=1 << 20) as f:
+        f.write(",".join(CSV_HEADER) + CSV_EOL)
+
+        # Stream rows straight from the cursor
+        cur.execute(f"SELECT {COLUMNS_SQL} FROM {src} ORDER BY company, feature")
+        for r in cur:
+            f.write(csv_line(r))
+
+    companies = [c for (c,) in cur.execute(
+        f"SELECT DISTINCT company FROM {src} ORDER BY company")]
+    features = [feat for (feat,) in cur.execute(
+        f"SELECT DISTINCT feature FROM {src} ORDER BY feature")]
+    policy_rows = cur.execute(f"""
+        SELECT company, feature,
+               avg_concurrent, peak_concurrent, policy_max,
+               active_utilization_pct, period_utilization_pct, utilization_status
+        FROM {src}
+        ORDER BY company, feature
+    """)  # iterated while writing summary.md
 
     # ----------------------------
     # Summary.md
     # ----------------------------
-    with open(md_path, "w") as f:
-        f.write(f"# {period_name.capitalize()} License Usage Summary\n\n")
-        f.write(f"- Generated: {now}\n")
-        f.write(f"- Source view: `{view_name}`\n\n")
-
-        companies = sorted(set(r[1] for r in rows))
-        features  = sorted(set(r[2] for r in rows))
-
-        f.write(f"## Active Companies ({len(companies)})\n")
-        for c in companies:
-            f.write(f"- {c}\n")
-        f.write("\n")
-
-        f.write("## Features Used\n")
-        for feat in features:
-            f.write(f"- {feat}\n")
-        f.write("\n")
-
-        f.write("## Policy Effectiveness\n")
-        for r in rows:
-            (
-                period, company, feature,
-                usage_count, active_users, active_snapshots,
-                usage_minutes, usage_hours, usage_ratio,
+    summary = SUMMARY_MD_TEMPLATE.substitute(
+        title=period_name.capitalize(),
+        now=now,
+        view_name=view_name,
+        company_count=len(companies),
+        companies="".join(f"- {c}\n" for c in companies),
+        features="".join(f"- {feat}\n" for feat in features),
+        policy="".join(
+            f"- {company} / {feature}: "
+            f"avg_concurrent={avg_concurrent}, "
+            f"peak_concurrent={peak_concurrent}, "
+            f"policy_max={policy_max}, "
+            f"active_util={active_utilization_pct}%, "
+            f"period_util={period_utilization_pct}%, "
+            f"status={status}\n"
+            for (
+                company, feature,
                 avg_concurrent, peak_concurrent, policy_max,
                 active_utilization_pct, period_utilization_pct, status
-            ) = r
-
-            f.write(
-                f"- {company} / {feature}: "
-                f"avg_concurrent={avg_concurrent}, "
-                f"peak_concurrent={peak_concurrent}, "
-                f"policy_max={policy_max}, "
-                f"active_util={active_utilization_pct}%, "
-                f"period_util={period_utilization_pct}%, "
-                f"status={status}\n"
-            )
+            ) in policy_rows
+        ),
+    )
+
+    with open(md_path, "w") as f:
+        f.write(summary)
+
+    return period_name, csv_path.replace(BASE, "")
 
-        f.write("\n")
-        f.write("### Metric Definitions (Audit 기준)\n")
-        f.write("- **usage_count**: Number of snapshots with active checkout\n")
-        f.write("- **active_users**: Distinct users in the period\n")
-        f.write("- **active_snapshots**: Time slices with activity\n")
-        f.write("- **avg_concurrent**: time-weighted average = usage_hours / period_hours\n")
-        f.write("- **peak_concurrent**: MAX simultaneous checkouts at any single snapshot\n")
-        f.write("- **policy_max**: MAX copy from options.opt\n")
-        f.write("- **active_utilization_pct**: (avg concurrent when in use) / policy_max * 100\n")
-        f.write("- **period_utilization_pct**: usage_hours / (policy_max * period_hours) * 100\n")
-        f.write("- **utilization_status** (based on period_utilization_pct):\n")
-        f.write("  - EFFECTIVE_USE: ≥ 60% of capacity\n")
-        f.write("  - PARTIAL_USE: 20–60% of capacity\n")
-        f.write("  - UNDERUTILIZED: < 20% of capacity\n")
-        f.write("  - NO_POLICY: no MAX rule defined\n")
-
-    index_rows.append((period_name, csv_path.replace(BASE, "")))
+
+# The periods read different views and write different files, so they run
+# side by side; SQLite serves concurrent readers, and each worker overlaps
+# its query with the others' file writing
+con = sqlite3.connect(DB)
+use_mv = refresh_usage_mv(con)
+con.close()
+
+with ThreadPoolExecutor(max_workers=len(PERIODS)) as pool:
+    index_rows = list(pool.map(lambda p: build_period(*p, use_mv), PERIODS))
 
 # ------------------------------------------------------------
 # index.html (ABSOLUTE file:// links)
 # ------------------------------------------------------------
 index_path = f"{RPT}/index.html"
 
-with open(index_path, "w") as f:
-    f.write("<html><head><title>License Monitor Reports</title></head><body>\n")
-    f.write("<h1>License Monitor Reports</h1>\n")
-    f.write(f"<p>Generated: {now}</p>\n")
-    f.write("<ul>\n")
-
-    for period_name, view_name in PERIODS:
-        csv_abs = f"file://{BASE}/reports/{period_name}/usage_{period_name}.csv"
-        md_abs  = f"file://{BASE}/reports/{period_name}/summary.md"
-
-        f.write(
-            f"<li>{period_name.capitalize()}: "
-            f"<a href='{csv_abs}'>CSV</a> | "
-            f"<a href='{md_abs}'>Summary</a>"
-            f"</li>\n"
-        )
-
-    f.write("</ul>\n")
-    f.write("</body></html>\n")
-
-con.close()
+items = "".join(
+    f"<li>{period_name.capitalize()}: "
+    f"<a href='file://{BASE}/reports/{period_name}/usage_{period_name}.csv'>CSV</a> | "
+    f"<a href='file://{BASE}/reports/{period_name}/summary.md'>Summary</a>"
+    f"</li>\n"
+    for period_name, _ in PERIODS
+)
 
+with open(index_path, "w") as f:
+    f.write(INDEX_HTML_TEMPLATE.substitute(now=now, items=items))
@@ -0,0 +1,39 @@
+#!/usr/local/python-3.12.2/bin/python3.12
+#
+# migrate_db.py
+# Bring an existing database up to the current init_db.sql schema.
+#
+# CREATE TABLE IF NOT EXISTS in init_db.sql never adds columns to a table
+# that already exists, so columns introduced later are added here, each
+# guarded by a PRAGMA table_xinfo check. Safe to re-run.
+#
+
+import os
+import sqlite3
+
+BASE = os.environ.get("LICENSE_MONITOR_HOME", "/home/appl/license_monitor")
+DB   = f"{BASE}/db/license_monitor.db"
+
+# Generated columns on lmstat_snapshot: (name, expression, index DDL)
+DERIVED_COLUMNS = [
+    ("ts_date", "substr(ts, 1, 10)",
+     "CREATE INDEX IF NOT EXISTS idx_snapshot_date_feature ON lmstat_snapshot(ts_date, feature)"),
+    ("company", "substr(user, 1, instr(user, '-') - 1)",
+     "CREATE INDEX IF NOT EXISTS idx_snapshot_company ON lmstat_snapshot(company)"),
+]
+
+con = sqlite3.connect(DB)
+cur = con.cursor()
+
+# One transaction: a failure leaves the schema as it was
+cur.execute("BEGIN")
+cols = {row[1] for row in cur.execute("PRAGMA table_xinfo(lmstat_snapshot)")}
+for name, expr, index_sql in DERIVED_COLUMNS:
+    if name not in cols:
+        # ALTER TABLE only accepts VIRTUAL generated columns; the index stores the values
+        cur.execute(f"ALTER TABLE lmstat_snapshot ADD COLUMN "
+                    f"{name} TEXT GENERATED ALWAYS AS ({expr}) VIRTUAL")
+        print(f"Added column lmstat_snapshot.{name}")
+    cur.execute(index_sql)
+con.commit()
+con.close()
@@ -451,3 +451,73 @@ LEFT JOIN (
   FROM license_policy
   GROUP BY company, feature
 ) p ON y.company = p.company AND y.feature = p.feature;
+
+
+-- ============================================================
+-- 7. MATERIALIZED REPORT TABLES
+--    Snapshots of the *_ext views that make_reports.py reads.
+--    Before each run it re-aggregates only the periods touched by
+--    lmstat_snapshot rows past mv_usage_state.last_id, and rebuilds
+--    everything when the state row is missing.
+--
+--    Contract for writers:
+--      * Appending rows to lmstat_snapshot needs nothing extra
+--        (ingest_lmstat.py, incremental bulk_ingest.py).
+--      * Anything that updates, deletes or re-inserts existing rows,
+--        or changes license_policy, MUST run
+--          DELETE FROM mv_usage_state;
+--        in the same transaction (bulk_ingest.py --full,
+--        ingest_policy.py, any cleanup/pruning script).
+--    Staleness is not inferred from ids or row counts.
+-- ============================================================
+
+DROP TABLE IF EXISTS mv_usage_weekly;
+
+CREATE TABLE mv_usage_weekly AS
+SELECT * FROM v_usage_weekly_ext;
+
+CREATE INDEX idx_mv_usage_weekly_cf ON mv_usage_weekly(company, feature);
+CREATE INDEX idx_mv_usage_weekly_period ON mv_usage_weekly(period);
+
+
+DROP TABLE IF EXISTS mv_usage_monthly;
+
+CREATE TABLE mv_usage_monthly AS
+SELECT * FROM v_usage_monthly_ext;
+
+CREATE INDEX idx_mv_usage_monthly_cf ON mv_usage_monthly(company, feature);
+CREATE INDEX idx_mv_usage_monthly_period ON mv_usage_monthly(period);
+
+
+DROP TABLE IF EXISTS mv_usage_quarterly;
+
+CREATE TABLE mv_usage_quarterly AS
+SELECT * FROM v_usage_quarterly_ext;
+
+CREATE INDEX idx_mv_usage_quarterly_cf ON mv_usage_quarterly(company, feature);
+CREATE INDEX idx_mv_usage_quarterly_period ON mv_usage_quarterly(period);
+
+
+DROP TABLE IF EXISTS mv_usage_yearly;
+
+CREATE TABLE mv_usage_yearly AS
+SELECT * FROM v_usage_yearly_ext;
+
+CREATE INDEX idx_mv_usage_yearly_cf ON mv_usage_yearly(company, feature);
+CREATE INDEX idx_mv_usage_yearly_period ON mv_usage_yearly(period);
+
+
+-- The state table only exists when all four tables above were built:
+-- the statement references each of them, so it fails and leaves no
+-- state behind if one is missing (e.g. views.sql run before
+-- ingest_policy.py created license_policy). make_reports.py then reads
+-- the views directly until views.sql is re-run.
+DROP TABLE IF EXISTS mv_usage_state;
+
+CREATE TABLE mv_usage_state AS
+SELECT COALESCE(MAX(id), 0) AS last_id
+FROM lmstat_snapshot
+WHERE NOT EXISTS (SELECT 1 FROM mv_usage_weekly WHERE 0)
+  AND NOT EXISTS (SELECT 1 FROM mv_usage_monthly WHERE 0)
+  AND NOT EXISTS (SELECT 1 FROM mv_usage_quarterly WHERE 0)
+  AND NOT EXISTS (SELECT 1 FROM mv_usage_yearly WHERE 0);
@@ -6,41 +6,46 @@ from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "db" / "license_monitor.db"
 
-conn = sqlite3.connect(str(DB_PATH))
+FEATURE = "sally-cute"
+DAY_START, DAY_END = "2026-01-28", "2026-01-29"
+
+# Read-only: a diagnostic must never change the schema or take a write lock
+conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
 cur = conn.cursor()
 
-# Check total records for sally-cute on 2026-01-28
+# A plain ts range (not substr(ts,1,10)) lets idx_snap_feat_ts (init_db.sql)
+# serve the filter as an index range scan, with no sort for ORDER BY ts
+
+# One round-trip: the totals plus the first and last 10 records for
+# sally-cute on 2026-01-28, each row tagged with the section it belongs to
 cur.execute("""
-    SELECT COUNT(*) as total, MIN(ts) as first_ts, MAX(ts) as last_ts 
-    FROM lmstat_snapshot 
-    WHERE feature='sally-cute' AND substr(ts,1,10)='2026-01-28'
-""")
-result = cur.fetchone()
-print(f"Total records: {result[0]}")
-print(f"First timestamp: {result[1]}")
-print(f"Last timestamp: {result[2]}")
+    WITH f AS (
+        SELECT ts, feature, user
+        FROM lmstat_snapshot
+        WHERE feature = ? AND ts >= ? AND ts < ?
+    )
+    SELECT 'stat', COUNT(*), MIN(ts), MAX(ts) FROM f
+    UNION ALL
+    SELECT * FROM (SELECT 'head', ts, feature, user FROM f ORDER BY ts LIMIT 10)
+    UNION ALL
+    SELECT * FROM (SELECT 'tail', ts, feature, user FROM f ORDER BY ts DESC LIMIT 10)
+""", (FEATURE, DAY_START, DAY_END))
+sections = {"stat": [], "head": [], "tail": []}
+for tag, *row in cur:
+    sections[tag].append(tuple(row))
+
+total, first_ts, last_ts = sections["stat"][0]
+print(f"Total records: {total}")
+print(f"First timestamp: {first_ts}")
+print(f"Last timestamp: {last_ts}")
 
 # Show sample records
 print("\n=== Sample records (first 10) ===")
-cur.execute("""
-    SELECT ts, feature, user 
-    FROM lmstat_snapshot 
-    WHERE feature='sally-cute' AND substr(ts,1,10)='2026-01-28'
-    ORDER BY ts
-    LIMIT 10
-""")
-for row in cur.fetchall():
+for row in sections["head"]:
     print(row)
 
 print("\n=== Sample records (last 10) ===")
-cur.execute("""
-    SELECT ts, feature, user 
-    FROM lmstat_snapshot 
-    WHERE feature='sally-cute' AND substr(ts,1,10)='2026-01-28'
-    ORDER BY ts DESC
-    LIMIT 10
-""")
-for row in cur.fetchall():
+for row in sections["tail"]:
     print(row)
 
 conn.close()
@@ -0,0 +1,29 @@
+"""parse_snapshot_ts must accept both ts formats written by the ingesters."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("PyQt5")
+pytest.importorskip("matplotlib")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bin"))
+from license_monitor_gui import parse_snapshot_ts  # noqa: E402
+
+
+@pytest.mark.parametrize("ts", [
+    "2026-01-28 10-04-22",   # ingest_lmstat.py
+    "2026-01-28 10:04:22",   # bulk_ingest.py
+    "2026-01-28_10-04-22",   # raw file-name stamp
+])
+def test_stored_formats(ts):
+    parsed = parse_snapshot_ts(pd.Series([ts]))
+    assert parsed.iloc[0] == pd.Timestamp("2026-01-28 10:04:22")
+
+
+def test_mixed_formats_and_garbage():
+    parsed = parse_snapshot_ts(pd.Series(["2026-01-28 10-04-22", "2026-01-28 10:05:22", "bad"]))
+    assert list(parsed[:2]) == [pd.Timestamp("2026-01-28 10:04:22"), pd.Timestamp("2026-01-28 10:05:22")]
+    assert pd.isna(parsed.iloc[2])